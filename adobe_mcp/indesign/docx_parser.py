@@ -31,13 +31,16 @@ Extracts structured content from Word documents including:
 """
 
 import os
+import stat
+import time
+import hashlib
 import zipfile
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
-import base64
+from lxml import etree as ET
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet, Iterator
 import tempfile
-import re
-
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 # Word XML namespaces
 NAMESPACES = {
@@ -50,59 +53,219 @@ NAMESPACES = {
 }
 
 
+def _qname(prefix: str, local: str) -> str:
+    """Build a Clark-notation ``{namespace}local`` key."""
+    return ET.QName(NAMESPACES[prefix], local).text
+
+
+# Element tags, built once so lookups compare against ready-made strings
+W_BODY_TAG = _qname('w', 'body')
+W_P_TAG = _qname('w', 'p')
+W_TBL_TAG = _qname('w', 'tbl')
+W_TR_TAG = _qname('w', 'tr')
+W_TC_TAG = _qname('w', 'tc')
+W_R_TAG = _qname('w', 'r')
+W_T_TAG = _qname('w', 't')
+W_DRAWING_TAG = _qname('w', 'drawing')
+W_STYLE_TAG = _qname('w', 'style')
+W_NAME_TAG = _qname('w', 'name')
+W_BASEDON_TAG = _qname('w', 'basedOn')
+W_PPR_TAG = _qname('w', 'pPr')
+W_RPR_TAG = _qname('w', 'rPr')
+W_PSTYLE_TAG = _qname('w', 'pStyle')
+W_JC_TAG = _qname('w', 'jc')
+W_SPACING_TAG = _qname('w', 'spacing')
+W_IND_TAG = _qname('w', 'ind')
+W_RFONTS_TAG = _qname('w', 'rFonts')
+W_SZ_TAG = _qname('w', 'sz')
+W_B_TAG = _qname('w', 'b')
+W_I_TAG = _qname('w', 'i')
+W_U_TAG = _qname('w', 'u')
+W_COLOR_TAG = _qname('w', 'color')
+A_BLIP_TAG = _qname('a', 'blip')
+WP_EXTENT_TAG = _qname('wp', 'extent')
+REL_RELATIONSHIP_TAG = _qname('rel', 'Relationship')
+
+# Attribute keys
+W_VAL = _qname('w', 'val')
+W_STYLEID = _qname('w', 'styleId')
+W_TYPE = _qname('w', 'type')
+W_BEFORE = _qname('w', 'before')
+W_AFTER = _qname('w', 'after')
+W_LINE = _qname('w', 'line')
+W_LEFT = _qname('w', 'left')
+W_RIGHT = _qname('w', 'right')
+W_FIRSTLINE = _qname('w', 'firstLine')
+W_ASCII = _qname('w', 'ascii')
+W_HANSI = _qname('w', 'hAnsi')
+R_EMBED = _qname('r', 'embed')
+
+# Package parts read by the parser
+_DOCUMENT_PART = 'word/document.xml'
+_STYLES_PART = 'word/styles.xml'
+_RELS_PART = 'word/_rels/document.xml.rels'
+
+# Elements that iterparse stops on while streaming the document body
+_BLOCK_TAGS = (W_P_TAG, W_TBL_TAG)
+
+# Chunk size used when copying embedded images out of the archive
+_COPY_BUFFER_SIZE = 1 << 20
+
+# Run formatting bits in the columnar layout payload the InDesign server sends
+RUN_BOLD = 1
+RUN_ITALIC = 2
+RUN_UNDERLINE = 4
+
+# Upper bound on threads used to extract images in parallel
+_MAX_IMAGE_WORKERS = 8
+
+def _image_store_dir() -> str:
+    """Return the per-user image store path under the system temp directory."""
+    name = "adobe_mcp_docx_images"
+    if hasattr(os, "getuid"):
+        # The temp directory is shared between accounts on POSIX systems
+        name += f"_{os.getuid()}"
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+# Content-addressed store for extracted images, so identical images (in one
+# document or across re-imports) are written to disk only once
+IMAGE_STORE_DIR = _image_store_dir()
+
+# Total size the image store is trimmed back to, oldest-used images first
+IMAGE_STORE_MAX_BYTES = 512 * 1024 * 1024
+
+# Images used within this many seconds are never trimmed, so parses still
+# being imported (by this or another tool call) keep their files
+IMAGE_STORE_MIN_AGE = 60 * 60
+
+
+def _release(elem):
+    """Free a parsed element and any already-processed siblings before it."""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
 class DocxParser:
-    """Parse DOCX files and extract structured content for InDesign."""
+    """
+    Parse DOCX files and extract structured content for InDesign.
+    
+    Use as a context manager so the extracted-image directory is removed on
+    exit. Pass ``keep=True`` to detach the directory from the parser so the
+    images outlive it; it is still removed if parsing raises. Pass
+    ``image_store`` to write images into a shared content-addressed directory
+    instead, which is never removed by the parser.
+    """
     
-    def __init__(self, docx_path: str):
+    def __init__(self, docx_path: str, keep: bool = False, image_store: Optional[str] = None):
         self.docx_path = docx_path
-        self.temp_dir = tempfile.mkdtemp(prefix="docx_images_")
+        self.keep = keep
+        self.image_store = image_store
+        if image_store is not None:
+            _make_private_dir(image_store)
+            self._temp_dir = None
+            self.temp_dir = image_store
+        elif keep:
+            self._temp_dir = None
+            self.temp_dir = tempfile.mkdtemp(prefix="docx_images_")
+        else:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="docx_images_")
+            self.temp_dir = self._temp_dir.name
         self.relationships = {}
+        self._image_parts: List[Tuple[str, str, str]] = []  # (rel_id, target, part name)
+        self._names: FrozenSet[str] = frozenset()
         self.styles = {}
+        self._style_id_to_name: Dict[str, str] = {}
         self.content_blocks = []
+        # Top-level blocks per style name, in order of first use
+        self.style_counts: Counter = Counter()
         self.extracted_images = []
+        # Local intern table for repeated names (fonts, colors, styles) so
+        # user content doesn't go into Python's global intern table
+        self._intern_cache: Dict[str, str] = {}
+    
+    def __enter__(self) -> "DocxParser":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None or not self.keep:
+            self.cleanup()
         
-    def parse(self) -> Dict[str, Any]:
+    def parse(self, *, include_images: bool = True) -> Dict[str, Any]:
         """
         Parse the DOCX file and return structured content.
         
+        Args:
+            include_images: Extract embedded images to the temp directory.
+                Pass False when only text and styles are needed.
+        
         Returns:
             dict: {
                 "styles": [{"name": str, "basedOn": str, "formatting": dict}, ...],
                 "content": [{"type": str, "style": str, "runs": [...], ...}, ...],
+                "style_counts": {style name: number of top-level blocks, ...},
                 "images": [{"id": str, "path": str, "width": int, "height": int}, ...]
             }
         """
-        if not os.path.exists(self.docx_path):
-            raise FileNotFoundError(f"DOCX file not found: {self.docx_path}")
+        for _ in self.iter_parse(include_images=include_images):
+            pass
+        return self.result(include_images=include_images)
+    
+    def iter_parse(self, *, include_images: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Parse the DOCX file, yielding each top-level block as it is parsed.
         
+        Blocks are also collected as in parse(), and images are extracted once
+        the content is exhausted; call result() afterwards for the full result.
+        This lets callers start work on early blocks while parsing continues.
+        """
+        # Opening the archive raises FileNotFoundError for a missing file
         with zipfile.ZipFile(self.docx_path, 'r') as docx:
-            # Parse relationships first (for images)
-            self._parse_relationships(docx)
-            
-            # Parse styles
-            self._parse_styles(docx)
+            # Relationships and styles first; content refers to both
+            self._parse_package(docx)
             
             # Parse main document content
-            self._parse_document(docx)
+            for block in self._iter_document(docx):
+                self.content_blocks.append(block)
+                yield block
             
             # Extract images
-            self._extract_images(docx)
-        
+            if include_images:
+                self._extract_images(docx)
+    
+    def result(self, *, include_images: bool = True) -> Dict[str, Any]:
+        """Return the structured content collected by a finished iter_parse()."""
         return {
             "source_file": self.docx_path,
             "styles": list(self.styles.values()),
             "content": self.content_blocks,
+            "style_counts": dict(self.style_counts),
             "images": self.extracted_images,
-            "image_temp_dir": self.temp_dir
+            # The shared store isn't this parse's to hand out
+            "image_temp_dir": self.temp_dir if include_images and self.image_store is None else None
         }
     
+    def _parse_package(self, docx: zipfile.ZipFile):
+        """Read the package parts that content blocks depend on."""
+        # Enumerate the central directory once for all part lookups
+        self._names = frozenset(docx.namelist())
+        
+        # Parse relationships first (for images)
+        self._parse_relationships(docx)
+        
+        # Parse styles
+        self._parse_styles(docx)
+    
     def _parse_relationships(self, docx: zipfile.ZipFile):
         """Parse document relationships to map image IDs to file paths."""
-        try:
-            rels_xml = docx.read('word/_rels/document.xml.rels')
-            root = ET.fromstring(rels_xml)
-            
-            for rel in root.findall('.//{%s}Relationship' % NAMESPACES['rel']):
+        if _RELS_PART not in self._names:
+            return  # No relationships file
+        
+        with docx.open(_RELS_PART) as fh:
+            for _, rel in ET.iterparse(fh, events=('end',), tag=REL_RELATIONSHIP_TAG):
                 rel_id = rel.get('Id')
                 target = rel.get('Target')
                 rel_type = rel.get('Type', '')
@@ -111,170 +274,187 @@ class DocxParser:
                     'target': target,
                     'type': rel_type
                 }
-        except KeyError:
-            pass  # No relationships file
+                
+                if 'image' in rel_type.lower():
+                    # Handle relative paths
+                    if target.startswith('/'):
+                        part_name = target[1:]
+                    else:
+                        part_name = 'word/' + target
+                    self._image_parts.append((rel_id, target, part_name))
+                
+                _release(rel)
     
     def _parse_styles(self, docx: zipfile.ZipFile):
         """Parse document styles."""
-        try:
-            styles_xml = docx.read('word/styles.xml')
-            root = ET.fromstring(styles_xml)
-            
-            for style in root.findall('.//w:style', NAMESPACES):
-                style_id = style.get('{%s}styleId' % NAMESPACES['w'])
-                style_type = style.get('{%s}type' % NAMESPACES['w'])
-                
-                # Get style name
-                name_elem = style.find('w:name', NAMESPACES)
-                style_name = name_elem.get('{%s}val' % NAMESPACES['w']) if name_elem is not None else style_id
-                
-                # Get basedOn
-                based_on_elem = style.find('w:basedOn', NAMESPACES)
-                based_on = based_on_elem.get('{%s}val' % NAMESPACES['w']) if based_on_elem is not None else None
-                
-                # Extract formatting properties
-                formatting = self._extract_style_formatting(style)
-                
-                self.styles[style_id] = {
-                    'id': style_id,
-                    'name': style_name,
-                    'type': style_type,
-                    'basedOn': based_on,
-                    'formatting': formatting
-                }
-        except KeyError:
-            pass  # No styles file
+        if _STYLES_PART in self._names:
+            with docx.open(_STYLES_PART) as fh:
+                for _, style in ET.iterparse(fh, events=('end',), tag=W_STYLE_TAG):
+                    style_id = style.get(W_STYLEID)
+                    style_type = style.get(W_TYPE)
+                    
+                    # Get style name
+                    name_elem = style.find(W_NAME_TAG)
+                    style_name = self._intern(name_elem.get(W_VAL)) if name_elem is not None else style_id
+                    
+                    # Get basedOn
+                    based_on_elem = style.find(W_BASEDON_TAG)
+                    based_on = based_on_elem.get(W_VAL) if based_on_elem is not None else None
+                    
+                    # Extract formatting properties
+                    formatting = self._extract_style_formatting(style)
+                    
+                    self.styles[style_id] = {
+                        'id': style_id,
+                        'name': style_name,
+                        'type': style_type,
+                        'basedOn': based_on,
+                        'formatting': formatting
+                    }
+                    _release(style)
+        
+        self._style_id_to_name = {sid: s['name'] for sid, s in self.styles.items()}
     
     def _extract_style_formatting(self, style_elem) -> Dict[str, Any]:
         """Extract formatting properties from a style element."""
         formatting = {}
         
         # Paragraph properties
-        pPr = style_elem.find('w:pPr', NAMESPACES)
+        pPr = style_elem.find(W_PPR_TAG)
         if pPr is not None:
-            # Alignment
-            jc = pPr.find('w:jc', NAMESPACES)
-            if jc is not None:
-                formatting['alignment'] = jc.get('{%s}val' % NAMESPACES['w'])
-            
-            # Spacing
-            spacing = pPr.find('w:spacing', NAMESPACES)
-            if spacing is not None:
-                if spacing.get('{%s}before' % NAMESPACES['w']):
-                    formatting['spaceBefore'] = int(spacing.get('{%s}before' % NAMESPACES['w'])) / 20  # twips to points
-                if spacing.get('{%s}after' % NAMESPACES['w']):
-                    formatting['spaceAfter'] = int(spacing.get('{%s}after' % NAMESPACES['w'])) / 20
-                if spacing.get('{%s}line' % NAMESPACES['w']):
-                    formatting['lineSpacing'] = int(spacing.get('{%s}line' % NAMESPACES['w'])) / 240  # to lines
-            
-            # Indentation
-            ind = pPr.find('w:ind', NAMESPACES)
-            if ind is not None:
-                if ind.get('{%s}left' % NAMESPACES['w']):
-                    formatting['leftIndent'] = int(ind.get('{%s}left' % NAMESPACES['w'])) / 20
-                if ind.get('{%s}right' % NAMESPACES['w']):
-                    formatting['rightIndent'] = int(ind.get('{%s}right' % NAMESPACES['w'])) / 20
-                if ind.get('{%s}firstLine' % NAMESPACES['w']):
-                    formatting['firstLineIndent'] = int(ind.get('{%s}firstLine' % NAMESPACES['w'])) / 20
+            # One pass over pPr, dispatching on each child's tag
+            for child in pPr:
+                tag = child.tag
+                if tag == W_JC_TAG:
+                    # Alignment
+                    formatting['alignment'] = self._intern(child.get(W_VAL))
+                elif tag == W_SPACING_TAG:
+                    v = child.get(W_BEFORE)
+                    if v:
+                        formatting['spaceBefore'] = int(v) / 20  # twips to points
+                    v = child.get(W_AFTER)
+                    if v:
+                        formatting['spaceAfter'] = int(v) / 20
+                    v = child.get(W_LINE)
+                    if v:
+                        formatting['lineSpacing'] = int(v) / 240  # to lines
+                elif tag == W_IND_TAG:
+                    # Indentation
+                    v = child.get(W_LEFT)
+                    if v:
+                        formatting['leftIndent'] = int(v) / 20
+                    v = child.get(W_RIGHT)
+                    if v:
+                        formatting['rightIndent'] = int(v) / 20
+                    v = child.get(W_FIRSTLINE)
+                    if v:
+                        formatting['firstLineIndent'] = int(v) / 20
         
         # Run (character) properties
-        rPr = style_elem.find('w:rPr', NAMESPACES)
+        rPr = style_elem.find(W_RPR_TAG)
         if rPr is not None:
             formatting.update(self._extract_run_formatting(rPr))
         
         return formatting
     
+    def _intern(self, value: Optional[str]) -> Optional[str]:
+        """Return a single shared instance of a repeated string value."""
+        if value is None:
+            return None
+        return self._intern_cache.setdefault(value, value)
+    
     def _extract_run_formatting(self, rPr) -> Dict[str, Any]:
         """Extract character formatting from run properties."""
         formatting = {}
         
-        # Font
-        rFonts = rPr.find('w:rFonts', NAMESPACES)
-        if rFonts is not None:
-            formatting['fontFamily'] = rFonts.get('{%s}ascii' % NAMESPACES['w']) or rFonts.get('{%s}hAnsi' % NAMESPACES['w'])
-        
-        # Font size (half-points to points)
-        sz = rPr.find('w:sz', NAMESPACES)
-        if sz is not None:
-            formatting['fontSize'] = int(sz.get('{%s}val' % NAMESPACES['w'])) / 2
-        
-        # Bold
-        b = rPr.find('w:b', NAMESPACES)
-        if b is not None:
-            val = b.get('{%s}val' % NAMESPACES['w'])
-            formatting['bold'] = val != '0' and val != 'false'
-        
-        # Italic
-        i = rPr.find('w:i', NAMESPACES)
-        if i is not None:
-            val = i.get('{%s}val' % NAMESPACES['w'])
-            formatting['italic'] = val != '0' and val != 'false'
-        
-        # Underline
-        u = rPr.find('w:u', NAMESPACES)
-        if u is not None:
-            formatting['underline'] = u.get('{%s}val' % NAMESPACES['w']) != 'none'
-        
-        # Color
-        color = rPr.find('w:color', NAMESPACES)
-        if color is not None:
-            formatting['color'] = color.get('{%s}val' % NAMESPACES['w'])
+        # One pass over rPr, dispatching on each child's tag
+        for child in rPr:
+            tag = child.tag
+            if tag == W_RFONTS_TAG:
+                # Font
+                formatting['fontFamily'] = self._intern(child.get(W_ASCII) or child.get(W_HANSI))
+            elif tag == W_SZ_TAG:
+                # Font size (half-points to points)
+                formatting['fontSize'] = int(child.get(W_VAL)) / 2
+            elif tag == W_B_TAG:
+                # Bold
+                val = child.get(W_VAL)
+                formatting['bold'] = val != '0' and val != 'false'
+            elif tag == W_I_TAG:
+                # Italic
+                val = child.get(W_VAL)
+                formatting['italic'] = val != '0' and val != 'false'
+            elif tag == W_U_TAG:
+                # Underline
+                formatting['underline'] = child.get(W_VAL) != 'none'
+            elif tag == W_COLOR_TAG:
+                # Color
+                formatting['color'] = self._intern(child.get(W_VAL))
         
         return formatting
     
-    def _parse_document(self, docx: zipfile.ZipFile):
-        """Parse the main document content."""
-        doc_xml = docx.read('word/document.xml')
-        root = ET.fromstring(doc_xml)
-        
-        body = root.find('.//w:body', NAMESPACES)
-        if body is None:
-            return
-        
-        for child in body:
-            tag = child.tag.split('}')[-1]
-            
-            if tag == 'p':
-                block = self._parse_paragraph(child)
-                if block:
-                    self.content_blocks.append(block)
-            elif tag == 'tbl':
-                block = self._parse_table(child)
+    def _iter_document(self, docx: zipfile.ZipFile) -> Iterator[Dict[str, Any]]:
+        """Yield top-level blocks from the main document.
+
+        Top-level paragraphs and tables are streamed and released as they
+        complete; paragraphs inside tables wait for their enclosing table.
+        """
+        with docx.open(_DOCUMENT_PART) as fh:
+            for _, child in ET.iterparse(fh, events=('end',), tag=_BLOCK_TAGS):
+                parent = child.getparent()
+                if parent is None or parent.tag != W_BODY_TAG:
+                    continue
+                
+                if child.tag == W_P_TAG:
+                    block = self._parse_paragraph(child)
+                else:
+                    block = self._parse_table(child)
+                
+                _release(child)
                 if block:
-                    self.content_blocks.append(block)
+                    style = block.get('style')
+                    if style:
+                        self.style_counts[style] += 1
+                    yield block
     
     def _parse_paragraph(self, p_elem) -> Optional[Dict[str, Any]]:
         """Parse a paragraph element."""
+        # Get paragraph style (the schema puts pPr first when present)
+        style = None
+        pPr = p_elem[0] if len(p_elem) else None
+        if pPr is not None and pPr.tag == W_PPR_TAG:
+            pStyle = pPr.find(W_PSTYLE_TAG)
+            if pStyle is not None:
+                style_id = pStyle.get(W_VAL)
+                # Map to style name if available
+                style = self._style_id_to_name.get(style_id)
+                if style is None:
+                    style = self._intern(style_id)
+        
+        # Blank, unstyled spacing paragraphs are common; bail out before
+        # building anything for them
+        if style is None and next(p_elem.iter(W_R_TAG, W_DRAWING_TAG), None) is None:
+            return None
+        
         block = {
             'type': 'paragraph',
-            'style': None,
+            'style': style,
             'runs': [],
             'images': []
         }
         
-        # Get paragraph style
-        pPr = p_elem.find('w:pPr', NAMESPACES)
-        if pPr is not None:
-            pStyle = pPr.find('w:pStyle', NAMESPACES)
-            if pStyle is not None:
-                style_id = pStyle.get('{%s}val' % NAMESPACES['w'])
-                # Map to style name if available
-                if style_id in self.styles:
-                    block['style'] = self.styles[style_id]['name']
-                else:
-                    block['style'] = style_id
-        
-        # Parse runs (text segments)
-        for r in p_elem.findall('.//w:r', NAMESPACES):
-            run = self._parse_run(r)
-            if run:
-                block['runs'].append(run)
-        
-        # Parse inline images
-        for drawing in p_elem.findall('.//w:drawing', NAMESPACES):
-            img_info = self._parse_drawing(drawing)
-            if img_info:
-                block['images'].append(img_info)
+        # Parse runs (text segments) and inline images in one walk
+        parse_run = self._parse_run
+        add_run = block['runs'].append
+        for elem in p_elem.iter(W_R_TAG, W_DRAWING_TAG):
+            if elem.tag == W_R_TAG:
+                run = parse_run(elem)
+                if run:
+                    add_run(run)
+            else:
+                img_info = self._parse_drawing(elem)
+                if img_info:
+                    block['images'].append(img_info)
         
         # Skip empty paragraphs (no text, no images)
         if not block['runs'] and not block['images']:
@@ -286,7 +466,16 @@ class DocxParser:
     
     def _parse_run(self, r_elem) -> Optional[Dict[str, Any]]:
         """Parse a run (text segment) element."""
-        text_elem = r_elem.find('w:t', NAMESPACES)
+        # One pass over the children picks up both the text and run properties
+        text_elem = rPr = None
+        for child in r_elem:
+            tag = child.tag
+            if tag == W_T_TAG:
+                if text_elem is None:
+                    text_elem = child
+            elif tag == W_RPR_TAG:
+                rPr = child
+        
         if text_elem is None or text_elem.text is None:
             return None
         
@@ -296,7 +485,6 @@ class DocxParser:
         }
         
         # Get run properties
-        rPr = r_elem.find('w:rPr', NAMESPACES)
         if rPr is not None:
             run['formatting'] = self._extract_run_formatting(rPr)
         
@@ -305,18 +493,18 @@ class DocxParser:
     def _parse_drawing(self, drawing_elem) -> Optional[Dict[str, Any]]:
         """Parse a drawing (image) element."""
         # Look for blip (image reference)
-        blip = drawing_elem.find('.//a:blip', NAMESPACES)
+        blip = next(drawing_elem.iter(A_BLIP_TAG), None)
         if blip is None:
             return None
         
-        embed_id = blip.get('{%s}embed' % NAMESPACES['r'])
+        embed_id = blip.get(R_EMBED)
         if not embed_id or embed_id not in self.relationships:
             return None
         
         rel = self.relationships[embed_id]
         
         # Get image dimensions
-        extent = drawing_elem.find('.//wp:extent', NAMESPACES)
+        extent = next(drawing_elem.iter(WP_EXTENT_TAG), None)
         width = height = None
         if extent is not None:
             # EMUs to pixels (914400 EMUs per inch, assume 96 DPI)
@@ -341,14 +529,19 @@ class DocxParser:
             'rows': []
         }
         
-        for tr in tbl_elem.findall('.//w:tr', NAMESPACES):
+        # Only direct children at each level; nested tables are parsed by
+        # recursion so their rows and paragraphs aren't picked up twice
+        for tr in tbl_elem.iterchildren(W_TR_TAG):
             row = []
-            for tc in tr.findall('.//w:tc', NAMESPACES):
+            for tc in tr.iterchildren(W_TC_TAG):
                 cell_content = []
-                for p in tc.findall('.//w:p', NAMESPACES):
-                    para = self._parse_paragraph(p)
-                    if para:
-                        cell_content.append(para)
+                for child in tc.iterchildren(W_P_TAG, W_TBL_TAG):
+                    if child.tag == W_P_TAG:
+                        para = self._parse_paragraph(child)
+                        if para:
+                            cell_content.append(para)
+                    else:
+                        cell_content.append(self._parse_table(child))
                 row.append(cell_content)
             table['rows'].append(row)
         
@@ -356,53 +549,177 @@ class DocxParser:
     
     def _extract_images(self, docx: zipfile.ZipFile):
         """Extract embedded images to temp directory."""
-        for rel_id, rel in self.relationships.items():
-            if 'image' in rel.get('type', '').lower():
-                target = rel['target']
-                # Handle relative paths
-                if target.startswith('/'):
-                    img_path = target[1:]
-                else:
-                    img_path = 'word/' + target
+        # Group relationships by archive part so each part is extracted once
+        wanted: Dict[str, List[Tuple[str, str]]] = {}
+        for rel_id, target, part_name in self._image_parts:
+            wanted.setdefault(part_name, []).append((rel_id, target))
+        
+        # Visit members in storage order so reads move forward through the
+        # file instead of seeking back and forth per relationship
+        members = {info.filename: info for info in docx.infolist() if info.filename in wanted}
+        infos = sorted(members.values(), key=lambda info: info.header_offset)
+        
+        workers = min(_MAX_IMAGE_WORKERS, os.cpu_count() or 1, len(infos))
+        if workers <= 1:
+            extracted = self._extract_image_parts(docx, infos, wanted)
+        else:
+            # Each worker takes a contiguous stretch of the archive
+            size = -(-len(infos) // workers)
+            batches = [infos[i:i + size] for i in range(0, len(infos), size)]
+            extracted = {}
+            with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+                for batch in pool.map(lambda batch: self._extract_image_batch(batch, wanted), batches):
+                    extracted.update(batch)
+        
+        self.extracted_images.extend(
+            extracted[rel_id] for rel_id, _, _ in self._image_parts if rel_id in extracted
+        )
+        
+        if self.image_store is not None:
+            _trim_image_store(self.image_store, IMAGE_STORE_MAX_BYTES, IMAGE_STORE_MIN_AGE)
+    
+    def _extract_image_batch(self, infos: List[zipfile.ZipInfo],
+                             wanted: Dict[str, List[Tuple[str, str]]]) -> Dict[str, Dict[str, Any]]:
+        """Extract a batch of images on a worker thread."""
+        # ZipFile handles aren't safe to share across threads, so open our own
+        with zipfile.ZipFile(self.docx_path, 'r') as docx:
+            return self._extract_image_parts(docx, infos, wanted)
+    
+    def _extract_image_parts(self, docx: zipfile.ZipFile, infos: List[zipfile.ZipInfo],
+                             wanted: Dict[str, List[Tuple[str, str]]]) -> Dict[str, Dict[str, Any]]:
+        """Copy the given image parts out of the archive, keyed by relationship id."""
+        images = {}
+        for info in infos:
+            rels = wanted[info.filename]
+            
+            # Determine filename
+            filename = os.path.basename(rels[0][1])
+            if self.image_store is not None:
+                output_path = self._store_image(docx, info, os.path.splitext(filename)[1])
+            else:
+                output_path = os.path.join(self.temp_dir, filename)
                 
-                try:
-                    img_data = docx.read(img_path)
-                    
-                    # Determine filename
-                    filename = os.path.basename(target)
-                    output_path = os.path.join(self.temp_dir, filename)
-                    
-                    with open(output_path, 'wb') as f:
-                        f.write(img_data)
-                    
-                    self.extracted_images.append({
-                        'id': rel_id,
-                        'original_path': target,
-                        'extracted_path': output_path,
-                        'size_bytes': len(img_data)
-                    })
-                except KeyError:
-                    pass  # Image not found in archive
+                # Stream straight to disk rather than holding the image in memory
+                with docx.open(info) as src, open(output_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
+            
+            for rel_id, target in rels:
+                images[rel_id] = {
+                    'id': rel_id,
+                    'original_path': target,
+                    'extracted_path': output_path,
+                    'size_bytes': info.file_size
+                }
+        return images
+    
+    def _store_image(self, docx: zipfile.ZipFile, info: zipfile.ZipInfo, ext: str) -> str:
+        """Copy an image part into the shared store and return its path there."""
+        # Hash while copying under a temporary name, so the part is inflated
+        # once and a concurrent reader never sees a partial file
+        digest = hashlib.blake2b(digest_size=16)
+        fd, partial_path = tempfile.mkstemp(dir=self.image_store, suffix='.part')
+        try:
+            with docx.open(info) as src, os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(lambda: src.read(_COPY_BUFFER_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+            name = digest.hexdigest()
+            
+            bucket = os.path.join(self.image_store, name[:2])
+            output_path = os.path.join(bucket, name + ext)
+            try:
+                # Already stored; refresh its mtime so trimming treats it as recently used
+                os.utime(output_path)
+            except FileNotFoundError:
+                # Not stored yet, or trimmed by another process just now
+                pass
+            else:
+                os.unlink(partial_path)
+                return output_path
+            
+            os.makedirs(bucket, mode=0o700, exist_ok=True)
+            os.replace(partial_path, output_path)
+        except BaseException:
+            try:
+                os.unlink(partial_path)
+            except OSError:
+                pass
+            raise
+        return output_path
     
     def cleanup(self):
         """Remove temporary image files."""
-        import shutil
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        if self.image_store is not None:
+            # The shared store outlives individual parses
+            return
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+        else:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
 
 
-def parse_docx(docx_path: str) -> Dict[str, Any]:
+def parse_docx(docx_path: str, *, include_images: bool = True) -> Dict[str, Any]:
     """
     Convenience function to parse a DOCX file.
     
     Args:
         docx_path: Path to the DOCX file
+        include_images: Extract embedded images (skip for text-only previews)
         
     Returns:
         Structured content dictionary
     """
-    parser = DocxParser(docx_path)
-    return parser.parse()
+    # Images must outlive the parser so they can be placed in InDesign
+    image_store = IMAGE_STORE_DIR if include_images else None
+    with DocxParser(docx_path, image_store=image_store) as parser:
+        return parser.parse(include_images=include_images)
+
+
+def _make_private_dir(path: str):
+    """Create a directory only the current user can use, or check an existing one."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return
+    
+    # Another account may have created the path first; its files can't be trusted
+    st = os.lstat(path)
+    if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid()
+            or st.st_mode & (stat.S_IRWXG | stat.S_IRWXO)):
+        raise PermissionError(f"Image store is not a private directory owned by this user: {path}")
+
+
+def _trim_image_store(store: str, max_bytes: int, min_age: float):
+    """Delete least recently used images until the store fits in max_bytes.
+
+    Images used within min_age seconds are kept even if the store stays over.
+    """
+    entries = []
+    total = 0
+    for bucket in os.scandir(store):
+        if not bucket.is_dir():
+            continue
+        for entry in os.scandir(bucket.path):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                # Removed by another process's trim
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+    
+    if total <= max_bytes:
+        return
+    
+    cutoff = time.time() - min_age
+    entries.sort()
+    for mtime, size, path in entries:
+        if total <= max_bytes or mtime > cutoff:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
 
 
 def get_style_mapping_template(parsed_content: Dict[str, Any]) -> Dict[str, str]:
@@ -414,11 +731,14 @@ def get_style_mapping_template(parsed_content: Dict[str, Any]) -> Dict[str, str]
     """
     mapping = {}
     
-    # Get unique styles from content
-    styles_used = set()
-    for block in parsed_content.get('content', []):
-        if block.get('style'):
-            styles_used.add(block['style'])
+    # Styles used in content, as counted by the parser; scan the content
+    # only for results that don't carry the counts
+    styles_used = parsed_content.get('style_counts')
+    if styles_used is None:
+        styles_used = {}
+        for block in parsed_content.get('content', []):
+            if block.get('style'):
+                styles_used[block['style']] = None
     
     # Create default mapping (Word style -> InDesign style)
     # Common mappings
@@ -436,10 +756,7 @@ def get_style_mapping_template(parsed_content: Dict[str, Any]) -> Dict[str, str]
     }
     
     for style in styles_used:
-        if style in common_mappings:
-            mapping[style] = common_mappings[style]
-        else:
-            # Keep the same name by default
-            mapping[style] = style
+        # Keep the same name by default
+        mapping[style] = common_mappings.get(style, style)
     
     return mapping
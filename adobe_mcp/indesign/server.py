@@ -21,11 +21,21 @@
 # SOFTWARE.
 
 from mcp.server.fastmcp import FastMCP
-from ..shared import init, sendCommand, createCommand, socket_client
-from .docx_parser import parse_docx, get_style_mapping_template, DocxParser
+from ..shared import init, send, socket_client
+from . import docx_parser
+from .docx_parser import (
+    parse_docx, get_style_mapping_template, DocxParser,
+    RUN_BOLD, RUN_ITALIC, RUN_UNDERLINE
+)
 import sys
 import os
+import asyncio
 import json
+import re
+import threading
+from collections import OrderedDict
+from queue import Queue
+import hashlib
 
 #logger.log(f"Python path: {sys.executable}")
 #logger.log(f"PYTHONPATH: {os.environ.get('PYTHONPATH')}")
@@ -50,6 +60,128 @@ socket_client.configure(
 
 init(APPLICATION, socket_client)
 
+# Upper bounds on one layoutWordContentChunk command during Word import
+LAYOUT_CHUNK_MAX_BLOCKS = 500
+LAYOUT_CHUNK_MAX_BYTES = 1024 * 1024
+
+# Images sent per placeImagesFromWord command; each group is its own round
+# trip, so placing it has to fit inside PROXY_TIMEOUT
+IMAGE_BATCH_SIZE = 32
+
+# Number of parsed Word documents kept between tool calls
+PARSE_CACHE_SIZE = 8
+
+# Number of parse tokens remembered; older tokens are reported as expired
+PARSE_TOKEN_LIMIT = 256
+
+
+# Chunks parsed ahead of the layout session during a pipelined Word import
+PIPELINE_QUEUE_SIZE = 4
+
+# Parsed documents keyed by (path, mtime_ns, size, include_images), least
+# recently used first. mtime and size are only part of the key, so an edited
+# file misses the cache. Filled from tool threads and import pipelines alike.
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _cached_parse(key: tuple, include_images: bool):
+    """Return the cached parse for key, or None if missing or no longer usable."""
+    cache_key = key + (include_images,)
+    with _parse_cache_lock:
+        parsed = _parse_cache.get(cache_key)
+        if parsed is None:
+            return None
+        try:
+            # Mark the images as in use so the image store doesn't trim them
+            # while this parse is being imported
+            for img in parsed["images"]:
+                os.utime(img["extracted_path"])
+        except FileNotFoundError:
+            # Extracted images were removed (e.g. trimmed from the image store),
+            # so the cached parse is no longer usable
+            del _parse_cache[cache_key]
+            return None
+        _parse_cache.move_to_end(cache_key)
+        return parsed
+
+
+def _cache_parse(key: tuple, include_images: bool, parsed: dict):
+    with _parse_cache_lock:
+        _parse_cache[key + (include_images,)] = parsed
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+
+
+# Maps parse tokens handed to clients back to the file they were issued for,
+# least recently used first. Guarded by _parse_cache_lock.
+_parse_token_paths = OrderedDict()
+
+
+def _make_parse_token(path: str, mtime_ns: int, size: int) -> str:
+    key = f"{path}\0{mtime_ns}\0{size}".encode()
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+def _parse_key(docx_path: str) -> tuple:
+    """Stat a DOCX file once, returning the (path, mtime_ns, size) parse cache key."""
+    path = os.path.abspath(docx_path)
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def _stat_or_error(docx_path: str):
+    """Return (parse key, None), or (None, error result) if the file can't be read."""
+    try:
+        return _parse_key(docx_path), None
+    except FileNotFoundError:
+        return None, {"status": "error", "message": f"File not found: {docx_path}"}
+    except OSError as e:
+        return None, {"status": "error", "message": str(e)}
+
+
+def _get_parsed(key: tuple, include_images: bool = True) -> dict:
+    """Parse a DOCX file, reusing an earlier parse while the file is unchanged.
+
+    key comes from _parse_key, so the file is only stat'ed once per tool call.
+    """
+    parsed = _cached_parse(key, include_images)
+    if parsed is None:
+        parsed = parse_docx(key[0], include_images=include_images)
+        _cache_parse(key, include_images, parsed)
+    return _issue_parsed(key, parsed)
+
+
+def _issue_parsed(key: tuple, parsed: dict) -> dict:
+    """Register a parse token for a parse result and return a copy carrying it."""
+    token = _make_parse_token(*key)
+    with _parse_cache_lock:
+        _parse_token_paths[token] = key[0]
+        _parse_token_paths.move_to_end(token)
+        while len(_parse_token_paths) > PARSE_TOKEN_LIMIT:
+            _parse_token_paths.popitem(last=False)
+    
+    # Shallow copy so callers adding keys don't alter the cached entry
+    parsed = dict(parsed)
+    parsed["parse_token"] = token
+    return parsed
+
+
+def _get_parsed_by_token(parse_token: str):
+    """Return the parse a token was issued for, or None if the token is unknown.
+
+    The file is re-checked, so a token for a since-edited file yields a fresh parse.
+    """
+    with _parse_cache_lock:
+        path = _parse_token_paths.get(parse_token)
+        if path is None:
+            return None
+        _parse_token_paths.move_to_end(parse_token)
+    key, error = _stat_or_error(path)
+    if error:
+        return None
+    return _get_parsed(key)
+
 @mcp.tool()
 def create_document(
     width:int, height:int, pages:int = 0,
@@ -57,7 +189,7 @@ def create_document(
     columns:dict = {"count":1, "gutter":12},
     margins:dict = {"top":36, "bottom":36, "left":36, "right":36}):
 
-    command = createCommand("createDocument", {
+    return send("createDocument", {
         "intent":"WEB_INTENT",
         "pageWidth":width,
         "pageHeight":height,
@@ -67,8 +199,6 @@ def create_document(
         "pagesFacing":pages_facing
     })
 
-    return sendCommand(command)
-
 @mcp.resource("config://get_instructions")
 def get_instructions() -> str:
     """Read this first! Returns information and instructions on how to use Photoshop and this API"""
@@ -87,6 +217,7 @@ def get_instructions() -> str:
     To import a Word document into InDesign with automatic layout:
 
     1. Use `parse_word_document` to analyze the DOCX file and see its styles
+       (page through its content with `get_parsed_content` if needed)
     2. Use `get_style_mapping_suggestions` to preview how Word styles map to InDesign
     3. Optionally open an InDesign template with `open_document`
     4. Use `import_word_to_indesign` for the full automated workflow, or:
@@ -117,8 +248,7 @@ def get_paragraph_styles():
     Returns:
         list: Array of style objects with name, id, and formatting properties.
     """
-    command = createCommand("getParagraphStyles", {})
-    return sendCommand(command)
+    return send("getParagraphStyles", {})
 
 
 @mcp.tool()
@@ -153,33 +283,23 @@ def create_paragraph_style(
         right_indent (float): Right indent in points.
         color (dict): Text color as RGB dict {"red": 0-255, "green": 0-255, "blue": 0-255}.
     """
-    options = {"styleName": style_name}
-    
-    if based_on:
-        options["basedOn"] = based_on
-    if font_family:
-        options["fontFamily"] = font_family
-    if font_size is not None:
-        options["fontSize"] = font_size
-    if leading is not None:
-        options["leading"] = leading
-    if alignment:
-        options["alignment"] = alignment
-    if space_before is not None:
-        options["spaceBefore"] = space_before
-    if space_after is not None:
-        options["spaceAfter"] = space_after
-    if first_line_indent is not None:
-        options["firstLineIndent"] = first_line_indent
-    if left_indent is not None:
-        options["leftIndent"] = left_indent
-    if right_indent is not None:
-        options["rightIndent"] = right_indent
-    if color:
-        options["color"] = color
-    
-    command = createCommand("createParagraphStyle", options)
-    return sendCommand(command)
+    # Empty strings/dicts are treated as "not set", same as None
+    pairs = (
+        ("basedOn", based_on or None),
+        ("fontFamily", font_family or None),
+        ("fontSize", font_size),
+        ("leading", leading),
+        ("alignment", alignment or None),
+        ("spaceBefore", space_before),
+        ("spaceAfter", space_after),
+        ("firstLineIndent", first_line_indent),
+        ("leftIndent", left_indent),
+        ("rightIndent", right_indent),
+        ("color", color or None),
+    )
+    options = {"styleName": style_name, **{k: v for k, v in pairs if v is not None}}
+    
+    return send("createParagraphStyle", options)
 
 
 @mcp.tool()
@@ -196,8 +316,7 @@ def apply_paragraph_style(style_name: str, story_index: int = 0, paragraph_index
     if paragraph_index is not None:
         options["paragraphIndex"] = paragraph_index
     
-    command = createCommand("applyParagraphStyle", options)
-    return sendCommand(command)
+    return send("applyParagraphStyle", options)
 
 
 # =============================================================================
@@ -237,8 +356,7 @@ def create_text_frame(
     if content:
         options["content"] = content
     
-    command = createCommand("createTextFrame", options)
-    return sendCommand(command)
+    return send("createTextFrame", options)
 
 
 @mcp.tool()
@@ -256,8 +374,7 @@ def get_text_frames(page_index: int = None):
     if page_index is not None:
         options["pageIndex"] = page_index
     
-    command = createCommand("getTextFrames", options)
-    return sendCommand(command)
+    return send("getTextFrames", options)
 
 
 @mcp.tool()
@@ -269,11 +386,10 @@ def link_text_frames(source_frame_id: str, target_frame_id: str):
         source_frame_id (str): ID of the source text frame.
         target_frame_id (str): ID of the target text frame to flow into.
     """
-    command = createCommand("linkTextFrames", {
+    return send("linkTextFrames", {
         "sourceFrameId": source_frame_id,
         "targetFrameId": target_frame_id
     })
-    return sendCommand(command)
 
 
 @mcp.tool()
@@ -300,8 +416,7 @@ def insert_text(
     if style_name:
         options["styleName"] = style_name
     
-    command = createCommand("insertText", options)
-    return sendCommand(command)
+    return send("insertText", options)
 
 
 # =============================================================================
@@ -334,20 +449,17 @@ def place_image(
     Returns:
         dict: Information about the placed image including frame ID.
     """
+    pairs = (("width", width), ("height", height))
     options = {
         "imagePath": image_path,
         "pageIndex": page_index,
         "x": x,
         "y": y,
-        "fitOption": fit_option
+        "fitOption": fit_option,
+        **{k: v for k, v in pairs if v is not None}
     }
-    if width is not None:
-        options["width"] = width
-    if height is not None:
-        options["height"] = height
     
-    command = createCommand("placeImage", options)
-    return sendCommand(command)
+    return send("placeImage", options)
 
 
 @mcp.tool()
@@ -358,8 +470,7 @@ def get_images():
     Returns:
         list: Array of image objects with id, path, bounds, and page info.
     """
-    command = createCommand("getImages", {})
-    return sendCommand(command)
+    return send("getImages", {})
 
 
 # =============================================================================
@@ -378,14 +489,10 @@ def add_page(at_index: int = None, master_page: str = None):
     Returns:
         dict: Information about the new page including its index.
     """
-    options = {}
-    if at_index is not None:
-        options["atIndex"] = at_index
-    if master_page:
-        options["masterPage"] = master_page
+    pairs = (("atIndex", at_index), ("masterPage", master_page or None))
+    options = {k: v for k, v in pairs if v is not None}
     
-    command = createCommand("addPage", options)
-    return sendCommand(command)
+    return send("addPage", options)
 
 
 @mcp.tool()
@@ -396,8 +503,7 @@ def get_pages():
     Returns:
         list: Array of page objects with index, size, margins, and master page info.
     """
-    command = createCommand("getPages", {})
-    return sendCommand(command)
+    return send("getPages", {})
 
 
 @mcp.tool()
@@ -408,8 +514,7 @@ def get_master_pages():
     Returns:
         list: Array of master page objects with name and applied items.
     """
-    command = createCommand("getMasterPages", {})
-    return sendCommand(command)
+    return send("getMasterPages", {})
 
 
 # =============================================================================
@@ -427,41 +532,82 @@ def open_document(file_path: str):
     Returns:
         dict: Information about the opened document.
     """
-    command = createCommand("openDocument", {"filePath": file_path})
-    return sendCommand(command)
+    return send("openDocument", {"filePath": file_path})
+
+
+def _document_state():
+    """Return the active document's dirty state, or None if InDesign can't report it."""
+    # Connection errors propagate; the command that follows would fail the same way
+    try:
+        result = send("isDocumentDirty", {})
+    except socket_client.AppError:
+        return None
+    if not result or result.get("status") != "SUCCESS":
+        return None
+    return result.get("response")
 
 
 @mcp.tool()
-def save_document(file_path: str = None):
+def save_document(file_path: str = None, force: bool = False):
     """
     Saves the active document.
     
+    Saving in place is skipped when the document has no unsaved changes.
+    
     Args:
         file_path (str): Optional path to save to. None saves to current location.
+        force (bool): Save even if the document has no unsaved changes.
     """
+    if not file_path and not force:
+        state = _document_state()
+        if state and state.get("saved") and not state.get("dirty"):
+            return {"status": "skipped", "reason": "not_dirty"}
+    
     options = {}
     if file_path:
         options["filePath"] = file_path
     
-    command = createCommand("saveDocument", options)
-    return sendCommand(command)
+    return send("saveDocument", options)
+
+
+# (source path, source mtime, PDF path, preset) of the last successful export
+_last_export = None
 
 
 @mcp.tool()
-def export_pdf(file_path: str, preset: str = None):
+def export_pdf(file_path: str, preset: str = None, force: bool = False):
     """
     Exports the document as a PDF.
     
+    The export is skipped when the last export from this server wrote the
+    same document to the same path with the same preset, and the document
+    has not changed since.
+    
     Args:
         file_path (str): Absolute path for the output PDF file.
         preset (str): Optional PDF preset name (e.g., "High Quality Print").
+        force (bool): Export even if the existing PDF looks up to date.
     """
+    global _last_export
+    
+    pdf_path = os.path.abspath(file_path)
+    state = _document_state()
+    source = state.get("filePath") if state else None
+    export_key = None
+    if source and os.path.exists(source):
+        export_key = (source, os.stat(source).st_mtime_ns, pdf_path, preset)
+    
+    if (not force and export_key is not None and export_key == _last_export
+            and not state.get("dirty") and os.path.exists(pdf_path)):
+        return {"status": "skipped", "reason": "up_to_date"}
+    
     options = {"filePath": file_path}
     if preset:
         options["preset"] = preset
     
-    command = createCommand("exportPdf", options)
-    return sendCommand(command)
+    result = send("exportPdf", options)
+    _last_export = export_key if result and result.get("status") == "SUCCESS" else None
+    return result
 
 
 # =============================================================================
@@ -469,7 +615,7 @@ def export_pdf(file_path: str, preset: str = None):
 # =============================================================================
 
 @mcp.tool()
-def parse_word_document(docx_path: str):
+async def parse_word_document(docx_path: str, detail: str = "summary"):
     """
     Parses a Word document and returns its structured content.
     
@@ -478,23 +624,33 @@ def parse_word_document(docx_path: str):
     
     Args:
         docx_path (str): Absolute path to the .docx file.
+        detail (str): "summary" (default) omits content and images, which can be
+                      large; fetch them in pages with get_parsed_content.
+                      "full" includes them in the response.
     
     Returns:
         dict: Structured content including:
             - styles: List of Word styles found
-            - content: List of paragraphs with style and formatting info
-            - images: List of extracted images with paths
+            - content: List of paragraphs with style and formatting info ("full" only)
+            - images: List of extracted images with paths ("full" only)
             - style_mapping: Suggested Word-to-InDesign style mapping
+            - parse_token: Pass to import_word_to_indesign or get_parsed_content
+                           to reuse this parse
     """
-    if not os.path.exists(docx_path):
-        return {"status": "error", "message": f"File not found: {docx_path}"}
+    if detail not in ("summary", "full"):
+        return {"status": "error", "message": f"Unknown detail level: {detail}"}
+    
+    key, error = _stat_or_error(docx_path)
+    if error:
+        return error
     
     try:
-        parsed = parse_docx(docx_path)
+        # Parsing blocks for a while on large documents, so keep it off the event loop
+        parsed = await asyncio.to_thread(_get_parsed, key)
         style_mapping = get_style_mapping_template(parsed)
         parsed["style_mapping"] = style_mapping
         
-        return {
+        response = {
             "status": "success",
             "source_file": docx_path,
             "styles": parsed["styles"],
@@ -503,20 +659,59 @@ def parse_word_document(docx_path: str):
             "style_mapping": style_mapping,
             "content": parsed["content"],
             "images": parsed["images"],
-            "image_temp_dir": parsed["image_temp_dir"]
+            "parse_token": parsed["parse_token"]
         }
+        if detail == "summary":
+            del response["content"]
+            del response["images"]
+        return response
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+@mcp.tool()
+async def get_parsed_content(parse_token: str, offset: int = 0, limit: int = 200):
+    """
+    Returns a page of content blocks from an earlier parse_word_document call.
+    
+    Args:
+        parse_token (str): parse_token returned by parse_word_document.
+        offset (int): Index of the first content block to return.
+        limit (int): Maximum number of content blocks to return.
+    
+    Returns:
+        dict: The requested content blocks, the document's images, and the
+              total block count.
+    """
+    try:
+        parsed = await asyncio.to_thread(_get_parsed_by_token, parse_token)
     except Exception as e:
         return {"status": "error", "message": str(e)}
+    if parsed is None:
+        return {"status": "error", "message": f"Unknown or expired parse token: {parse_token}"}
+    
+    offset = max(offset, 0)
+    limit = max(limit, 0)
+    return {
+        "status": "success",
+        "offset": offset,
+        "limit": limit,
+        "total_blocks": len(parsed["content"]),
+        "content": parsed["content"][offset:offset + limit],
+        "images": parsed["images"]
+    }
 
 
 @mcp.tool()
-def import_word_to_indesign(
+async def import_word_to_indesign(
     docx_path: str,
     template_path: str = None,
     style_mapping: dict = None,
     auto_flow: bool = True,
     place_images: bool = True,
-    start_page: int = 0
+    start_page: int = 0,
+    parsed: dict = None,
+    parse_token: str = None
 ):
     """
     High-level tool to import a Word document into InDesign with automatic layout.
@@ -536,6 +731,11 @@ def import_word_to_indesign(
         auto_flow (bool): If True, automatically creates pages and flows text.
         place_images (bool): If True, places images from the Word document.
         start_page (int): Page index to start placing content.
+        parsed (dict): Optional result of an earlier parse_word_document call.
+                       When given, the document is not parsed again. A summary
+                       result is resolved through its parse_token.
+        parse_token (str): Optional parse_token from an earlier parse_word_document
+                           call, used to reuse that parse while the file is unchanged.
     
     Returns:
         dict: Status and summary of the import operation.
@@ -546,70 +746,89 @@ def import_word_to_indesign(
         "errors": []
     }
     
-    # Step 1: Parse Word document
+    # Step 1: Use the caller's or a cached parse; otherwise parse in the
+    # background while the content is laid out
+    pipeline = None
+    if parsed is not None and "content" not in parsed:
+        # A summary parse_word_document result; fall back to its token
+        parse_token = parse_token or parsed.get("parse_token")
+        parsed = None
     try:
-        parsed = parse_docx(docx_path)
-        results["steps_completed"].append("parsed_word_document")
-        results["content_blocks"] = len(parsed["content"])
-        results["images_found"] = len(parsed["images"])
+        if parsed is None and parse_token:
+            parsed = await asyncio.to_thread(_get_parsed_by_token, parse_token)
+        if parsed is None:
+            key = _parse_key(docx_path)
+            cached = _cached_parse(key, True)
+            if cached is not None:
+                parsed = _issue_parsed(key, cached)
+            else:
+                pipeline = _ParsePipeline(key, map_styles=style_mapping is None)
+                await asyncio.to_thread(pipeline.start)
     except Exception as e:
         results["status"] = "error"
         results["errors"].append(f"Failed to parse Word document: {e}")
         return results
     
-    # Step 2: Open template or use active document
-    if template_path:
-        try:
-            open_result = sendCommand(createCommand("openDocument", {"filePath": template_path}))
-            if open_result.get("status") == "FAILURE":
-                results["errors"].append(f"Failed to open template: {open_result.get('message')}")
-            else:
-                results["steps_completed"].append("opened_template")
-        except Exception as e:
-            results["errors"].append(f"Failed to open template: {e}")
-    
-    # Step 3: Build style mapping
-    if style_mapping is None:
-        style_mapping = get_style_mapping_template(parsed)
-    results["style_mapping"] = style_mapping
+    if pipeline is None:
+        results["steps_completed"].append("parsed_word_document")
+        if style_mapping is None:
+            style_mapping = get_style_mapping_template(parsed)
+        chunks = ((chunk, None) for chunk in _iter_content_chunks(parsed["content"]))
+        images = parsed.get("images", []) if place_images else []
+        get_images = lambda: images
+    else:
+        chunks = pipeline.chunks()
+        
+        def get_images():
+            pipeline.finish()
+            if not place_images or pipeline.parsed is None:
+                return []
+            return pipeline.parsed["images"]
     
-    # Step 4: Send content to InDesign for layout
-    content_payload = {
-        "content": parsed["content"],
-        "styleMapping": style_mapping,
+    # Step 2: Open template, stream content in chunks, then place images
+    layout_options = {
+        "templatePath": template_path,
+        "styleMapping": style_mapping or {},
         "autoFlow": auto_flow,
         "startPage": start_page
     }
     
     try:
-        layout_result = sendCommand(createCommand("layoutWordContent", content_payload))
-        if layout_result.get("status") == "SUCCESS":
-            results["steps_completed"].append("laid_out_content")
-            results["pages_created"] = layout_result.get("response", {}).get("pagesCreated", 0)
-            results["paragraphs_placed"] = layout_result.get("response", {}).get("paragraphsPlaced", 0)
-        else:
-            results["errors"].append(f"Layout failed: {layout_result.get('message')}")
+        import_result = await asyncio.to_thread(
+            _stream_word_content, chunks, layout_options, get_images, results
+        )
     except Exception as e:
-        results["errors"].append(f"Layout error: {e}")
-    
-    # Step 5: Place images
-    if place_images and parsed["images"]:
-        images_placed = 0
-        for img in parsed["images"]:
-            try:
-                img_result = sendCommand(createCommand("placeImageFromWord", {
-                    "imagePath": img["extracted_path"],
-                    "imageId": img["id"],
-                    "autoPosition": True
-                }))
-                if img_result.get("status") == "SUCCESS":
-                    images_placed += 1
-            except Exception as e:
-                results["errors"].append(f"Failed to place image {img['id']}: {e}")
-        
-        results["images_placed"] = images_placed
-        if images_placed > 0:
-            results["steps_completed"].append("placed_images")
+        import_result = None
+        results["errors"].append(f"Import error: {e}")
+    finally:
+        if pipeline is not None:
+            await asyncio.to_thread(pipeline.finish)
+    
+    if pipeline is not None:
+        if pipeline.error is not None:
+            results["errors"].append(f"Failed to parse Word document: {pipeline.error}")
+            parsed = {"content": [], "images": []}
+        else:
+            parsed = _issue_parsed(pipeline.key, pipeline.parsed)
+            results["steps_completed"].insert(0, "parsed_word_document")
+            if style_mapping is None:
+                style_mapping = get_style_mapping_template(parsed)
+    
+    results["content_blocks"] = len(parsed["content"])
+    results["images_found"] = len(parsed.get("images", []))
+    results["style_mapping"] = style_mapping
+    
+    if import_result is not None:
+        if import_result.get("status") == "SUCCESS":
+            response = import_result.get("response", {})
+            results["steps_completed"].extend(response.get("stepsCompleted", []))
+            results["errors"].extend(response.get("errors", []))
+            results["pages_created"] = response.get("pagesCreated", 0)
+            results["paragraphs_placed"] = response.get("paragraphsPlaced", 0)
+            if place_images and parsed.get("images"):
+                results["images_placed"] = response.get("imagesPlaced", 0)
+        else:
+            results["errors"].append(f"Import failed: {import_result.get('message')}")
     
     # Final status
     if not results["errors"]:
@@ -622,8 +841,241 @@ def import_word_to_indesign(
     return results
 
 
+# Approximate bytes a block and a run add to a chunk's columnar JSON beyond
+# their text: array separators, the style index, run count and run flags
+_COLUMN_BLOCK_OVERHEAD = 8
+_COLUMN_RUN_OVERHEAD = 5
+
+# Characters JSON escapes: '"' and '\\' take 2 bytes, control characters up to 6
+_JSON_ESCAPED = re.compile(r'["\\\x00-\x1f]')
+
+
+def _escape_overhead(text: str) -> int:
+    """Bytes JSON escaping adds to text beyond its UTF-8 length."""
+    if not _JSON_ESCAPED.search(text):
+        return 0
+    return sum(1 if ch in '"\\' else 5 for ch in _JSON_ESCAPED.findall(text))
+
+
+def _column_size(block) -> int:
+    """Estimate the bytes a block adds to _columnar_content() output."""
+    if block.get("type") == "table":
+        # Tables are sent as-is; they're rare enough to measure exactly
+        return _COLUMN_BLOCK_OVERHEAD + len(socket_client.OrjsonCodec.dumps(block.get("rows", [])))
+    
+    size = _COLUMN_BLOCK_OVERHEAD
+    for run in block.get("runs", []):
+        text = run.get("text", "")
+        # Up to 4 UTF-8 bytes per character outside ASCII
+        size += _COLUMN_RUN_OVERHEAD + (len(text) if text.isascii() else 4 * len(text))
+        size += _escape_overhead(text)
+    return size
+
+
+def _iter_content_chunks(content):
+    """Split content into chunks bounded by block count and columnar payload size."""
+    chunk = []
+    chunk_bytes = 0
+    for block in content:
+        block_bytes = _column_size(block)
+        if chunk and (len(chunk) >= LAYOUT_CHUNK_MAX_BLOCKS
+                      or chunk_bytes + block_bytes > LAYOUT_CHUNK_MAX_BYTES):
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(block)
+        chunk_bytes += block_bytes
+    if chunk:
+        yield chunk
+
+
+def _columnar_content(blocks):
+    """Pack content blocks into parallel arrays for layoutWordContentChunk.
+
+    Only what the layout uses is sent: block type, style, and each run's text
+    with its bold/italic/underline flags. Style names are sent once and
+    referenced by index; tables are rare, so they go by block index as-is.
+    """
+    style_index = {}
+    styles = []
+    run_counts = []
+    run_texts = []
+    run_flags = []
+    tables = {}
+    
+    for i, block in enumerate(blocks):
+        style = block.get("style")
+        if style:
+            if style not in style_index:
+                style_index[style] = len(style_index)
+            styles.append(style_index[style])
+        else:
+            styles.append(-1)
+        
+        if block.get("type") == "table":
+            tables[str(i)] = block.get("rows", [])
+            run_counts.append(0)
+            continue
+        
+        runs = block.get("runs", [])
+        run_counts.append(len(runs))
+        for run in runs:
+            formatting = run.get("formatting") or {}
+            run_texts.append(run.get("text", ""))
+            run_flags.append(
+                (RUN_BOLD if formatting.get("bold") else 0)
+                | (RUN_ITALIC if formatting.get("italic") else 0)
+                | (RUN_UNDERLINE if formatting.get("underline") else 0)
+            )
+    
+    return {
+        "styleNames": list(style_index),
+        "styles": styles,
+        "runCounts": run_counts,
+        "runTexts": run_texts,
+        "runFlags": run_flags,
+        "tables": tables
+    }
+
+
+def _stream_word_content(chunks, layout_options, get_images, results):
+    """Lay out content through a chunked layout session and return the final response.
+
+    chunks yields (blocks, style mapping additions or None); get_images is
+    called once the content has been sent and returns the images to place.
+    """
+    begin_result = send("beginLayoutWordContent", layout_options)
+    if begin_result.get("status") != "SUCCESS":
+        return begin_result
+    session_id = begin_result["response"]["sessionId"]
+    
+    for chunk, style_mapping in chunks:
+        payload = {"sessionId": session_id, "columns": _columnar_content(chunk)}
+        if style_mapping:
+            payload["styleMapping"] = style_mapping
+        
+        # Later chunks would flow after a gap, so stop on failure but still
+        # end the session so the plugin releases it
+        try:
+            chunk_result = send("layoutWordContentChunk", payload)
+        except Exception as e:
+            results["errors"].append(f"Layout error: {e}")
+            break
+        if chunk_result.get("status") != "SUCCESS":
+            results["errors"].append(f"Layout failed: {chunk_result.get('message')}")
+            break
+    
+    end_result = send("endLayoutWordContent", {"sessionId": session_id})
+    
+    # Images go after the session ends, in groups, so a document with many
+    # images isn't placed within a single command's timeout
+    placed, errors = _place_word_images(get_images())
+    response = end_result.get("response", {})
+    response["imagesPlaced"] = placed
+    response.setdefault("errors", []).extend(errors)
+    if placed:
+        response.setdefault("stepsCompleted", []).append("placed_images")
+    return end_result
+
+
+def _place_word_images(images):
+    """Place extracted images in groups of IMAGE_BATCH_SIZE, returning (placed count, error messages)."""
+    placed = 0
+    errors = []
+    for start in range(0, len(images), IMAGE_BATCH_SIZE):
+        group = images[start:start + IMAGE_BATCH_SIZE]
+        try:
+            result = send("placeImagesFromWord", {
+                "images": [
+                    {"imagePath": img["extracted_path"], "imageId": img["id"]}
+                    for img in group
+                ],
+                "autoPosition": True
+            })
+        except Exception as e:
+            errors.extend(f"Failed to place image {img['id']}: {e}" for img in group)
+            continue
+        
+        response = result.get("response", {})
+        placed += response.get("placed", 0)
+        errors.extend(
+            f"Failed to place image {img_result.get('imageId')}: {img_result.get('message')}"
+            for img_result in response.get("results", [])
+            if img_result.get("status") != "SUCCESS"
+        )
+    return placed, errors
+
+
+class _ParsePipeline:
+    """Parse a DOCX file on a background thread, handing content over in chunks.
+
+    Lets an import start laying out early content while the rest is still
+    being parsed. The finished result is cached like any other parse.
+    """
+    
+    def __init__(self, key: tuple, map_styles: bool):
+        self.key = key
+        # Send default mappings for styles as they first appear
+        self.map_styles = map_styles
+        self.parsed = None
+        self.error = None
+        self._chunks = Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self._first = None
+        self._exhausted = False
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+    
+    def _produce(self):
+        try:
+            # Looked up per parse, like parse_docx(), so the store can be reconfigured
+            with DocxParser(self.key[0], image_store=docx_parser.IMAGE_STORE_DIR) as parser:
+                for chunk in _iter_content_chunks(parser.iter_parse()):
+                    self._chunks.put(chunk)
+                parsed = parser.result()
+            _cache_parse(self.key, True, parsed)
+            self.parsed = parsed
+        except Exception as e:
+            self.error = e
+        finally:
+            self._chunks.put(None)
+    
+    def _next_chunk(self):
+        chunk = self._chunks.get()
+        if chunk is None:
+            self._exhausted = True
+        return chunk
+    
+    def start(self):
+        """Start parsing and wait for the first chunk; raises if parsing fails first."""
+        self._thread.start()
+        self._first = self._next_chunk()
+        if self._first is None and self.error is not None:
+            raise self.error
+    
+    def chunks(self):
+        """Yield (blocks, style mapping additions or None) as chunks are parsed."""
+        mapped = set()
+        chunk, self._first = self._first, None
+        while chunk is not None:
+            style_mapping = None
+            if self.map_styles:
+                style_mapping = {
+                    style: mapped_to
+                    for style, mapped_to in get_style_mapping_template({"content": chunk}).items()
+                    if style not in mapped
+                }
+                mapped.update(style_mapping)
+            yield chunk, style_mapping
+            chunk = self._next_chunk()
+    
+    def finish(self):
+        """Wait for parsing to complete, discarding chunks that weren't laid out."""
+        while not self._exhausted:
+            self._next_chunk()
+        self._thread.join()
+
+
 @mcp.tool()
-def get_style_mapping_suggestions(docx_path: str):
+async def get_style_mapping_suggestions(docx_path: str):
     """
     Analyzes a Word document and suggests style mappings to InDesign.
     
@@ -635,21 +1087,20 @@ def get_style_mapping_suggestions(docx_path: str):
     Returns:
         dict: Suggested mappings and style details from the Word document.
     """
-    if not os.path.exists(docx_path):
-        return {"status": "error", "message": f"File not found: {docx_path}"}
+    key, error = _stat_or_error(docx_path)
+    if error:
+        return error
     
     try:
-        parsed = parse_docx(docx_path)
+        parsed = await asyncio.to_thread(_get_parsed, key, False)
         mapping = get_style_mapping_template(parsed)
         
         # Get styles actually used in content
-        styles_used = {}
-        for block in parsed["content"]:
-            style = block.get("style")
-            if style:
-                if style not in styles_used:
-                    styles_used[style] = {"count": 0, "suggested_indesign_style": mapping.get(style, style)}
-                styles_used[style]["count"] += 1
+        counts = parsed["style_counts"]
+        styles_used = {
+            style: {"count": count, "suggested_indesign_style": mapping.get(style, style)}
+            for style, count in counts.items()
+        }
         
         return {
             "status": "success",
@@ -661,6 +1112,19 @@ def get_style_mapping_suggestions(docx_path: str):
         return {"status": "error", "message": str(e)}
 
 
+@mcp.tool()
+def clear_parse_cache():
+    """
+    Clears cached Word document parses.
+    
+    Parsed documents are reused across tool calls until the file changes on disk.
+    Use this to force the next call to re-read every document from scratch.
+    """
+    with _parse_cache_lock:
+        _parse_cache.clear()
+    return {"status": "success"}
+
+
 def main():
     """Run the InDesign MCP server."""
     mcp.run()
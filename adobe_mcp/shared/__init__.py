@@ -1,6 +1,6 @@
 """Shared utilities for Adobe MCP servers."""
 
-from .core import init, sendCommand, createCommand
+from .core import init, send, sendCommand, createCommand
 from . import socket_client
 from .socket_client import configure
 from .logger import log
@@ -8,6 +8,7 @@ from .fonts import list_all_fonts_postscript
 
 __all__ = [
     "init",
+    "send",
     "sendCommand", 
     "createCommand",
     "socket_client",
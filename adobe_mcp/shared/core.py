@@ -23,4 +23,8 @@ def sendCommand(command:dict):
     response = socket_client.send_message_blocking(command)
     
     logger.log(f"Final response: {response['status']}")
-    return response
\ No newline at end of file
+    return response
+
+def send(action:str, options:dict):
+    """Build and send a command in one call: sendCommand(createCommand(action, options))."""
+    return sendCommand(createCommand(action, options))
@@ -20,11 +20,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import atexit
 import socketio
 import time
 import threading
-import json
-from queue import Queue
+import orjson
+from queue import Queue, Empty
 from . import logger
 
 # Global configuration variables
@@ -32,121 +33,154 @@ proxy_url = None
 proxy_timeout = None
 application = None
 
-def send_message_blocking(command, timeout=None):
+class OrjsonCodec:
     """
-    Blocking function that connects to a Socket.IO server, sends a message,
-    waits for a response, then disconnects.
+    JSON module replacement for socket.io packets, backed by orjson.
     
-    Args:
-        command: The command to send
-        timeout (int): Maximum time to wait for response in seconds
-        
-    Returns:
-        dict: The response received from the server, or None if no response
+    Accepts and ignores the json.dumps keyword arguments socket.io passes.
     """
-    # Use global variables
-    global application, proxy_url, proxy_timeout
     
-    # Check if configuration is set
-    if not application or not proxy_url or not proxy_timeout:
-        logger.log("Socket client not configured. Call configure() first.")
-        return None
+    OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
     
-    # Use provided timeout or default
-    wait_timeout = timeout if timeout is not None else proxy_timeout
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, option=OrjsonCodec.OPTIONS).decode()
     
-    # Create a standard (non-async) SocketIO client with WebSocket transport only
-    sio = socketio.Client(logger=False)
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
+# Persistent connection to the proxy, shared by all commands. Requests are
+# serialized by the lock because the proxy routes responses by connection.
+_client = None
+_client_lock = threading.Lock()
+_responses = Queue()
+
+# Queued when the connection drops before a response arrives
+_DISCONNECTED = object()
+
+def _connect():
+    """Open the shared connection to the proxy."""
+    global _client
     
-    # Use a queue to get the response from the event handler
-    response_queue = Queue()
+    sio = socketio.Client(logger=False, json=OrjsonCodec, reconnection=False)
     
-    connection_failed = [False]         
-
     @sio.event
     def connect():
         logger.log(f"Connected to server with session ID: {sio.sid}")
-        
-        # Send the command
-        logger.log(f"Sending message to {application}: {command}")
-        sio.emit('command_packet', {
-            'type': "command",
-            'application': application,
-            'command': command
-        })
     
+    # Events from a connection that has since been replaced are ignored
     @sio.event
     def packet_response(data):
         logger.log(f"Received response: {data}")
-        response_queue.put(data)
-        # Disconnect after receiving the response
-        sio.disconnect()
+        if sio is _client:
+            _responses.put(data)
     
     @sio.event
     def disconnect():
         logger.log("Disconnected from server")
-        # If we disconnect without response, put None in the queue
-        if response_queue.empty():
-            response_queue.put(None)
-    
-    @sio.event
-    def connect_error(error):
-        logger.log(f"Connection error: {error}")
-        connection_failed[0] = True
-        response_queue.put(None)
-    
-    # Connect in a separate thread to avoid blocking the main thread during connection
-    def connect_and_wait():
-        try:
-            sio.connect(proxy_url, transports=['websocket'])
-            # Keep the client running until disconnect is called
-            sio.wait()
-        except Exception as e:
-            logger.log(f"Error: {e}")
-            connection_failed[0] = True
-            if response_queue.empty():
-                response_queue.put(None)
-            if sio.connected:
-                sio.disconnect()
-    
-    # Start the client in a separate thread
-    client_thread = threading.Thread(target=connect_and_wait)
-    client_thread.daemon = True
-    client_thread.start()
+        if sio is _client:
+            _responses.put(_DISCONNECTED)
     
+    _client = sio
     try:
-        # Wait for a response or timeout
-        logger.log("waiting for response...")
-        response = response_queue.get(timeout=wait_timeout)
+        sio.connect(proxy_url, transports=['websocket'], wait_timeout=proxy_timeout)
+    except Exception as e:
+        logger.log(f"Connection error: {e}")
+        _client = None
+        raise RuntimeError(f"Error: Could not connect to {application} command proxy server. Make sure that the proxy server is running listening on the correct url {proxy_url}.")
+    return sio
+
+def _disconnect():
+    """Drop the shared connection, if any."""
+    global _client
+    
+    sio, _client = _client, None
+    if sio is not None and sio.connected:
+        sio.disconnect()
 
-        if connection_failed[0]:
-            raise RuntimeError(f"Error: Could not connect to {application} command proxy server. Make sure that the proxy server is running listening on the correct url {proxy_url}.")
+def _emit(command):
+    """Send a command on the shared connection, reconnecting once if it has dropped."""
+    packet = {
+        'type': "command",
+        'application': application,
+        'command': command
+    }
+    
+    for attempt in range(2):
+        if _client is None or not _client.connected:
+            _disconnect()
+            _connect()
+        
+        # Anything still queued belongs to an earlier, abandoned request
+        while not _responses.empty():
+            _responses.get_nowait()
+        
+        try:
+            _client.emit('command_packet', packet)
+            return
+        except socketio.exceptions.SocketIOError as e:
+            logger.log(f"Send failed, reconnecting: {e}")
+            _disconnect()
+            if attempt:
+                raise RuntimeError(f"Error: Could not send command to {application} command proxy server at {proxy_url}. Original error: {e}")
 
-        if response:
-            logger.log("response received...")
-            try:
-                logger.log(json.dumps(response))
-            except:
-                logger.log(f"Response (not JSON-serializable): {response}")
+def send_message_blocking(command, timeout=None):
+    """
+    Blocking function that sends a message over the shared Socket.IO
+    connection and waits for the response.
+    
+    The connection is opened on first use and kept for later commands.
+    
+    Args:
+        command: The command to send
+        timeout (int): Maximum time to wait for response in seconds
+        
+    Returns:
+        dict: The response received from the server, or None if no response
+    """
+    # Check if configuration is set
+    if not application or not proxy_url or not proxy_timeout:
+        logger.log("Socket client not configured. Call configure() first.")
+        return None
+    
+    # Use provided timeout or default
+    wait_timeout = timeout if timeout is not None else proxy_timeout
+    
+    with _client_lock:
+        logger.log(f"Sending message to {application}: {command}")
+        _emit(command)
+        
+        try:
+            # Wait for a response or timeout
+            logger.log("waiting for response...")
+            response = _responses.get(timeout=wait_timeout)
+        except Empty as e:
+            # A late response must not be read as the answer to the next command
+            _disconnect()
+            raise RuntimeError(f"Error: Could not connect to {application}. Connection Timed Out. Make sure that {application} is running and that the MCP Plugin is connected. Original error: {e}")
+    
+    if response is _DISCONNECTED:
+        # The command may already have run, so it isn't retried
+        raise RuntimeError(f"Error: Lost connection to {application} command proxy server at {proxy_url} before a response was received.")
+    
+    if response:
+        logger.log("response received...")
+        try:
+            logger.log(OrjsonCodec.dumps(response))
+        except:
+            logger.log(f"Response (not JSON-serializable): {response}")
+        
+        if response["status"] == "FAILURE":
+            raise AppError(f"Error returned from {application}: {response['message']}")
+    
+    return response
 
-            if response["status"] == "FAILURE":
-                raise AppError(f"Error returned from {application}: {response['message']}")
-            
-        return response
-    except AppError:
-        raise
-    except Exception as e:
-        logger.log(f"Error waiting for response: {e}")
-        if sio.connected:
-            sio.disconnect()
-  
-        raise RuntimeError(f"Error: Could not connect to {application}. Connection Timed Out. Make sure that {application} is running and that the MCP Plugin is connected. Original error: {e}")
-    finally:
-        # Make sure client is disconnected
-        if sio.connected:
-            sio.disconnect()
-        # Wait for the thread to finish (should be quick after disconnect)
-        client_thread.join(timeout=1)
+def close():
+    """Close the shared connection to the proxy. It reopens on the next command."""
+    with _client_lock:
+        _disconnect()
 
 class AppError(Exception):
     pass
@@ -162,4 +196,9 @@ def configure(app=None, url=None, timeout=None):
     if timeout:
         proxy_timeout = timeout
     
-    logger.log(f"Socket client configured: app={application}, url={proxy_url}, timeout={proxy_timeout}")
\ No newline at end of file
+    # Reconnect with the new settings on the next command
+    close()
+    
+    logger.log(f"Socket client configured: app={application}, url={proxy_url}, timeout={proxy_timeout}")
+
+atexit.register(close)
@@ -0,0 +1,324 @@
+"""Test DOCX parsing for the InDesign Word import."""
+import os
+import zipfile
+
+import pytest
+
+from adobe_mcp.indesign import docx_parser
+from adobe_mcp.indesign.docx_parser import DocxParser, get_style_mapping_template
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+PIC_NS = "http://schemas.openxmlformats.org/drawingml/2006/picture"
+IMAGE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+STYLES_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{W_NS}">
+  <w:style w:type="paragraph" w:styleId="Normal">
+    <w:name w:val="Normal"/>
+    <w:pPr><w:spacing w:before="240" w:after="120" w:line="360"/><w:ind w:left="720" w:firstLine="360"/><w:jc w:val="both"/></w:pPr>
+    <w:rPr><w:rFonts w:ascii="Calibri"/><w:sz w:val="22"/></w:rPr>
+  </w:style>
+  <w:style w:type="paragraph" w:styleId="Heading1">
+    <w:name w:val="heading 1"/>
+    <w:basedOn w:val="Normal"/>
+    <w:rPr><w:b/><w:sz w:val="32"/><w:color w:val="2E74B5"/></w:rPr>
+  </w:style>
+</w:styles>"""
+
+RELS_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+  <Relationship Id="rId5" Type="{IMAGE_REL}" Target="media/image1.png"/>
+  <Relationship Id="rId6" Type="{IMAGE_REL}" Target="media/image2.png"/>
+</Relationships>"""
+
+IMAGE1 = b"\x89PNG first image" * 64
+IMAGE2 = b"\x89PNG second image" * 64
+
+
+def para(*runs, style=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{ppr}{''.join(runs)}</w:p>"
+
+
+def run(text, rpr=""):
+    return f'<w:r>{f"<w:rPr>{rpr}</w:rPr>" if rpr else ""}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def drawing(rel_id, cx=914400, cy=457200):
+    return (
+        f'<w:r><w:drawing><wp:inline><wp:extent cx="{cx}" cy="{cy}"/>'
+        f'<a:graphic><a:graphicData><pic:pic><pic:blipFill><a:blip r:embed="{rel_id}"/>'
+        f"</pic:blipFill></pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>"
+    )
+
+
+def table(*rows):
+    return "<w:tbl><w:tblPr/>" + "".join(
+        "<w:tr>" + "".join(f"<w:tc>{cell}</w:tc>" for cell in row) + "</w:tr>" for row in rows
+    ) + "</w:tbl>"
+
+
+def write_docx(path, body, media=None):
+    """Write a minimal DOCX package with the given body XML and media parts."""
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}" xmlns:wp="{WP_NS}" '
+        f'xmlns:a="{A_NS}" xmlns:pic="{PIC_NS}"><w:body>{body}<w:sectPr/></w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", "<Types/>")
+        docx.writestr("word/_rels/document.xml.rels", RELS_XML)
+        docx.writestr("word/styles.xml", STYLES_XML)
+        docx.writestr("word/document.xml", document)
+        for name, data in (media or {}).items():
+            docx.writestr(f"word/media/{name}", data)
+    return str(path)
+
+
+SAMPLE_BODY = "".join([
+    para(run("Chapter One"), style="Heading1"),
+    para(
+        run("Plain "),
+        run("bold", "<w:b/>"),
+        run(" and ", '<w:b w:val="0"/>'),
+        run("styled", '<w:rFonts w:ascii="Arial"/><w:i/><w:u w:val="single"/><w:sz w:val="24"/><w:color w:val="FF0000"/>'),
+        style="Normal",
+    ),
+    para(),                                   # blank, unstyled: skipped
+    para(style="Normal"),                     # blank but styled: kept as spacing
+    para(drawing("rId5"), run("Figure 1")),
+    para(drawing("rId6"), drawing("rId5")),
+])
+
+
+@pytest.fixture
+def sample_docx(tmp_path):
+    return write_docx(tmp_path / "sample.docx", SAMPLE_BODY,
+                      {"image1.png": IMAGE1, "image2.png": IMAGE2})
+
+
+@pytest.fixture
+def image_store(tmp_path, monkeypatch):
+    store = str(tmp_path / "images")
+    monkeypatch.setattr(docx_parser, "IMAGE_STORE_DIR", store)
+    return store
+
+
+def test_styles(sample_docx):
+    with DocxParser(sample_docx) as parser:
+        parsed = parser.parse(include_images=False)
+
+    assert parsed["styles"] == [
+        {
+            "id": "Normal",
+            "name": "Normal",
+            "type": "paragraph",
+            "basedOn": None,
+            "formatting": {
+                "spaceBefore": 12.0,
+                "spaceAfter": 6.0,
+                "lineSpacing": 1.5,
+                "leftIndent": 36.0,
+                "firstLineIndent": 18.0,
+                "alignment": "both",
+                "fontFamily": "Calibri",
+                "fontSize": 11.0,
+            },
+        },
+        {
+            "id": "Heading1",
+            "name": "heading 1",
+            "type": "paragraph",
+            "basedOn": "Normal",
+            "formatting": {"bold": True, "fontSize": 16.0, "color": "2E74B5"},
+        },
+    ]
+
+
+def test_paragraphs_and_runs(sample_docx):
+    with DocxParser(sample_docx) as parser:
+        content = parser.parse(include_images=False)["content"]
+
+    assert content[:3] == [
+        {
+            "type": "paragraph",
+            "style": "heading 1",
+            "runs": [{"text": "Chapter One", "formatting": {}}],
+            "images": [],
+        },
+        {
+            "type": "paragraph",
+            "style": "Normal",
+            "runs": [
+                {"text": "Plain ", "formatting": {}},
+                {"text": "bold", "formatting": {"bold": True}},
+                {"text": " and ", "formatting": {"bold": False}},
+                {"text": "styled", "formatting": {
+                    "fontFamily": "Arial",
+                    "italic": True,
+                    "underline": True,
+                    "fontSize": 12.0,
+                    "color": "FF0000",
+                }},
+            ],
+            "images": [],
+        },
+        {"type": "paragraph", "style": "Normal", "runs": [], "images": []},
+    ]
+    assert content[3]["runs"] == [{"text": "Figure 1", "formatting": {}}]
+    assert content[3]["images"] == [
+        {"id": "rId5", "target": "media/image1.png", "width": 96, "height": 48}
+    ]
+    assert [img["id"] for img in content[4]["images"]] == ["rId6", "rId5"]
+    assert len(content) == 5
+
+
+def test_style_counts(sample_docx):
+    with DocxParser(sample_docx) as parser:
+        parsed = parser.parse(include_images=False)
+
+    assert parsed["style_counts"] == {"heading 1": 1, "Normal": 2}
+    assert get_style_mapping_template(parsed) == {"heading 1": "heading 1", "Normal": "Body Text"}
+
+
+def test_iter_parse_matches_parse(sample_docx):
+    with DocxParser(sample_docx) as parser:
+        streamed = list(parser.iter_parse(include_images=False))
+        result = parser.result(include_images=False)
+    with DocxParser(sample_docx) as parser:
+        parsed = parser.parse(include_images=False)
+
+    assert streamed == result["content"] == parsed["content"]
+
+
+def test_images_extracted(sample_docx):
+    with DocxParser(sample_docx) as parser:
+        parsed = parser.parse()
+        images = parsed["images"]
+        assert [(img["id"], img["original_path"], img["size_bytes"]) for img in images] == [
+            ("rId5", "media/image1.png", len(IMAGE1)),
+            ("rId6", "media/image2.png", len(IMAGE2)),
+        ]
+        for img, data in zip(images, (IMAGE1, IMAGE2)):
+            with open(img["extracted_path"], "rb") as fh:
+                assert fh.read() == data
+        temp_dir = parsed["image_temp_dir"]
+
+    # The parser's own image directory goes away with it
+    assert not os.path.exists(temp_dir)
+
+
+def test_images_skipped(sample_docx):
+    with DocxParser(sample_docx) as parser:
+        parsed = parser.parse(include_images=False)
+
+    assert parsed["images"] == []
+    assert parsed["image_temp_dir"] is None
+    # Drawing references are still reported on their paragraphs
+    assert [img["id"] for img in parsed["content"][4]["images"]] == ["rId6", "rId5"]
+
+
+def test_image_store_deduplicates(tmp_path, image_store):
+    first = write_docx(tmp_path / "first.docx", para(drawing("rId5")), {"image1.png": IMAGE1})
+    second = write_docx(tmp_path / "second.docx", para(drawing("rId6")), {"image2.png": IMAGE1})
+
+    parsed = docx_parser.parse_docx(first)
+    path1 = parsed["images"][0]["extracted_path"]
+    path2 = docx_parser.parse_docx(second)["images"][0]["extracted_path"]
+
+    assert path1 == path2
+    assert path1.startswith(image_store)
+    with open(path1, "rb") as fh:
+        assert fh.read() == IMAGE1
+    assert not [name for name in os.listdir(image_store) if name.endswith(".part")]
+    # The shared store isn't reported as the parse's own directory
+    assert parsed["image_temp_dir"] is None
+
+
+def test_image_store_restores_image_trimmed_during_parse(tmp_path, image_store, monkeypatch):
+    path = write_docx(tmp_path / "doc.docx", para(drawing("rId5")), {"image1.png": IMAGE1})
+    stored = docx_parser.parse_docx(path)["images"][0]["extracted_path"]
+    utime = os.utime
+
+    def trimmed_first(target, *args, **kwargs):
+        # Another process trims the image just before it is refreshed
+        os.remove(target)
+        return utime(target, *args, **kwargs)
+
+    monkeypatch.setattr(os, "utime", trimmed_first)
+    again = docx_parser.parse_docx(path)["images"][0]["extracted_path"]
+
+    assert again == stored
+    with open(again, "rb") as fh:
+        assert fh.read() == IMAGE1
+
+
+def test_trim_image_store_skips_vanished_entries(tmp_path, monkeypatch):
+    store = tmp_path / "images"
+    bucket = store / "ab"
+    bucket.mkdir(parents=True)
+    old = bucket / "old.png"
+    old.write_bytes(b"x" * 100)
+    os.utime(old, (0, 0))
+    scandir = os.scandir
+
+    class Vanished:
+        path = str(bucket / "gone.png")
+
+        def stat(self):
+            raise FileNotFoundError(self.path)
+
+    def racing_scandir(path):
+        entries = list(scandir(path))
+        return entries + [Vanished()] if path == str(bucket) else entries
+
+    monkeypatch.setattr(os, "scandir", racing_scandir)
+    docx_parser._trim_image_store(str(store), max_bytes=10, min_age=0)
+
+    assert not old.exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_image_store_must_be_private(tmp_path):
+    store = tmp_path / "images"
+    store.mkdir(mode=0o755)
+    os.chmod(store, 0o755)
+
+    with pytest.raises(PermissionError):
+        DocxParser(str(tmp_path / "unused.docx"), image_store=str(store))
+
+
+def test_nested_tables(tmp_path):
+    inner = table([para(run("inner a"))], [para(run("inner b"))])
+    outer = table(
+        [para(run("a1")), para(run("b1"), style="Normal") + inner],
+        [para(run("a2"))],
+    )
+    path = write_docx(tmp_path / "tables.docx", outer + para(run("after")))
+
+    with DocxParser(path) as parser:
+        content = parser.parse(include_images=False)["content"]
+
+    def text(block):
+        return "".join(r["text"] for r in block["runs"])
+
+    assert len(content) == 2
+    tbl = content[0]
+    assert tbl["type"] == "table"
+    assert len(tbl["rows"]) == 2
+    cell_a1, cell_b1 = tbl["rows"][0]
+    assert [text(p) for p in cell_a1] == ["a1"]
+
+    # The nested table's paragraphs belong to it, not to the outer cell
+    assert [b["type"] for b in cell_b1] == ["paragraph", "table"]
+    assert text(cell_b1[0]) == "b1"
+    assert [[[text(p) for p in cell] for cell in row] for row in cell_b1[1]["rows"]] == [
+        [["inner a"]],
+        [["inner b"]],
+    ]
+    assert [[text(p) for p in cell] for cell in tbl["rows"][1]] == [["a2"]]
+    assert text(content[1]) == "after"
@@ -0,0 +1,417 @@
+"""Test the InDesign server's Word import plumbing without a running InDesign."""
+import asyncio
+import os
+
+import orjson
+import pytest
+
+from adobe_mcp.indesign import docx_parser, server
+from adobe_mcp.shared import socket_client
+from adobe_mcp.indesign.docx_parser import RUN_BOLD, RUN_ITALIC, RUN_UNDERLINE
+from tests.test_docx_parser import SAMPLE_BODY, IMAGE1, IMAGE2, para, run, table, write_docx
+
+
+def decode_columns(columns):
+    """Python port of decodeColumnarContent in uxp-plugins/indesign/commands/layout.js."""
+    content = []
+    run_index = 0
+    for i, style_index in enumerate(columns["styles"]):
+        style = columns["styleNames"][style_index] if style_index >= 0 else None
+        rows = columns["tables"].get(str(i))
+        if rows:
+            content.append({"type": "table", "style": style, "rows": rows})
+            continue
+
+        runs = []
+        for _ in range(columns["runCounts"][i]):
+            flags = columns["runFlags"][run_index]
+            runs.append({
+                "text": columns["runTexts"][run_index],
+                "formatting": {
+                    "bold": bool(flags & RUN_BOLD),
+                    "italic": bool(flags & RUN_ITALIC),
+                    "underline": bool(flags & RUN_UNDERLINE),
+                },
+            })
+            run_index += 1
+        content.append({"type": "paragraph", "style": style, "runs": runs})
+    return content
+
+
+def layout_view(block):
+    """The parts of a parsed block the InDesign layout reads."""
+    if block["type"] == "table":
+        return {"type": "table", "style": block.get("style"), "rows": block["rows"]}
+    return {
+        "type": "paragraph",
+        "style": block.get("style"),
+        "runs": [
+            {
+                "text": r["text"],
+                "formatting": {key: bool(r["formatting"].get(key)) for key in ("bold", "italic", "underline")},
+            }
+            for r in block["runs"]
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(docx_parser, "IMAGE_STORE_DIR", str(tmp_path / "images"))
+    monkeypatch.setattr(server, "_last_export", None)
+    server._parse_cache.clear()
+    server._parse_token_paths.clear()
+    yield
+    server._parse_cache.clear()
+    server._parse_token_paths.clear()
+
+
+@pytest.fixture
+def sample_docx(tmp_path):
+    body = SAMPLE_BODY + table([para(run("cell")), para(run("other"))]) + para(run("end"), style="Normal")
+    return write_docx(tmp_path / "sample.docx", body, {"image1.png": IMAGE1, "image2.png": IMAGE2})
+
+
+class FakeInDesign:
+    """Records commands instead of sending them; responses come from handlers."""
+
+    def __init__(self):
+        self.commands = []
+        self.handlers = {}
+
+    def send(self, action, options):
+        self.commands.append((action, options))
+        response = self.handlers[action](options) if action in self.handlers else {}
+        return {"status": "SUCCESS", "response": response}
+
+    def actions(self):
+        return [action for action, _ in self.commands]
+
+
+@pytest.fixture
+def indesign(monkeypatch):
+    fake = FakeInDesign()
+    monkeypatch.setattr(server, "send", fake.send)
+    return fake
+
+
+def touch_later(path):
+    """Move a file's mtime forward so it reads as edited."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_chunks_round_trip(sample_docx, monkeypatch):
+    monkeypatch.setattr(server, "LAYOUT_CHUNK_MAX_BLOCKS", 2)
+    content = docx_parser.parse_docx(sample_docx, include_images=False)["content"]
+
+    chunks = list(server._iter_content_chunks(content))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+
+    decoded = []
+    for chunk in chunks:
+        # Columns go over the wire as JSON
+        columns = orjson.loads(orjson.dumps(server._columnar_content(chunk)))
+        decoded.extend(decode_columns(columns))
+
+    assert decoded == [layout_view(block) for block in content]
+
+
+def test_chunks_bounded_by_payload_size(monkeypatch):
+    monkeypatch.setattr(server, "LAYOUT_CHUNK_MAX_BYTES", 400)
+    content = [
+        {"type": "paragraph", "style": "Normal", "runs": [{"text": text * 10, "formatting": {"bold": True}}], "images": []}
+        for text in ("ascii ", "été ", "漢字 ") * 10
+    ]
+
+    chunks = list(server._iter_content_chunks(content))
+
+    assert sum(len(chunk) for chunk in chunks) == len(content)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(orjson.dumps(server._columnar_content(chunk))) <= 400
+
+
+def test_chunks_bounded_with_escaped_text(monkeypatch):
+    monkeypatch.setattr(server, "LAYOUT_CHUNK_MAX_BYTES", 400)
+    # Each character here takes 2 to 6 bytes once escaped as JSON
+    content = [
+        {"type": "paragraph", "style": "Normal", "runs": [{"text": '\x0b"\\' * 30, "formatting": {}}], "images": []}
+        for _ in range(4)
+    ]
+
+    chunks = list(server._iter_content_chunks(content))
+
+    assert len(chunks) == 4
+    for chunk in chunks:
+        assert len(orjson.dumps(server._columnar_content(chunk))) <= 400
+
+
+def test_parse_cache_reused_until_file_changes(tmp_path):
+    path = write_docx(tmp_path / "doc.docx", para(run("first"), style="Normal"))
+
+    first = server._get_parsed(server._parse_key(path))
+    again = server._get_parsed(server._parse_key(path))
+    assert again["content"] is first["content"]
+    assert again["parse_token"] == first["parse_token"]
+
+    write_docx(tmp_path / "doc.docx", para(run("second version"), style="Normal"))
+    touch_later(path)
+
+    changed = server._get_parsed(server._parse_key(path))
+    assert changed["content"][0]["runs"][0]["text"] == "second version"
+    assert changed["parse_token"] != first["parse_token"]
+
+    # An old token still resolves to the file, now re-parsed
+    by_old_token = server._get_parsed_by_token(first["parse_token"])
+    assert by_old_token["content"][0]["runs"][0]["text"] == "second version"
+
+
+def test_parse_cache_keyed_by_include_images(sample_docx):
+    key = server._parse_key(sample_docx)
+
+    assert server._get_parsed(key, False)["images"] == []
+    assert len(server._get_parsed(key, True)["images"]) == 2
+
+
+def test_parse_cache_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "PARSE_CACHE_SIZE", 2)
+    paths = [write_docx(tmp_path / f"doc{i}.docx", para(run(f"doc {i}"))) for i in range(3)]
+    for path in paths:
+        server._get_parsed(server._parse_key(path), False)
+
+    assert len(server._parse_cache) == 2
+    assert server._cached_parse(server._parse_key(paths[0]), False) is None
+
+
+def test_cached_parse_dropped_when_images_trimmed(sample_docx):
+    key = server._parse_key(sample_docx)
+    first = server._get_parsed(key)
+    os.remove(first["images"][0]["extracted_path"])
+
+    again = server._get_parsed(key)
+    assert again["content"] is not first["content"]
+    assert all(os.path.exists(img["extracted_path"]) for img in again["images"])
+
+
+def test_clear_parse_cache(tmp_path):
+    path = write_docx(tmp_path / "doc.docx", para(run("text")))
+    first = server._get_parsed(server._parse_key(path))
+
+    server.clear_parse_cache()
+
+    assert server._get_parsed(server._parse_key(path))["content"] is not first["content"]
+
+
+def test_parse_tokens_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "PARSE_TOKEN_LIMIT", 2)
+    paths = [write_docx(tmp_path / f"doc{i}.docx", para(run(f"doc {i}"))) for i in range(3)]
+    tokens = [server._get_parsed(server._parse_key(path), False)["parse_token"] for path in paths]
+
+    assert len(server._parse_token_paths) == 2
+    assert server._get_parsed_by_token(tokens[0]) is None
+    assert server._get_parsed_by_token(tokens[2])["content"][0]["runs"][0]["text"] == "doc 2"
+
+
+def test_import_word_accepts_parsed_without_images(tmp_path, indesign):
+    indesign.handlers["beginLayoutWordContent"] = lambda options: {"sessionId": "1"}
+    indesign.handlers["endLayoutWordContent"] = lambda options: {
+        "stepsCompleted": ["laid_out_content"], "errors": [], "paragraphsPlaced": 1
+    }
+    parsed = {"content": [{"type": "paragraph", "style": "Normal", "runs": [{"text": "x", "formatting": {}}]}]}
+
+    results = asyncio.run(server.import_word_to_indesign(str(tmp_path / "unused.docx"), parsed=parsed))
+
+    assert results["status"] == "success", results["errors"]
+    assert results["images_found"] == 0
+    assert "placeImagesFromWord" not in indesign.actions()
+
+
+def test_stream_word_content_places_images_in_groups(indesign, monkeypatch):
+    monkeypatch.setattr(server, "IMAGE_BATCH_SIZE", 2)
+    indesign.handlers["beginLayoutWordContent"] = lambda options: {"sessionId": "1"}
+    indesign.handlers["endLayoutWordContent"] = lambda options: {
+        "stepsCompleted": ["laid_out_content"], "errors": [], "paragraphsPlaced": 3
+    }
+    indesign.handlers["placeImagesFromWord"] = lambda options: {
+        "placed": len(options["images"]),
+        "results": [{"imageId": img["imageId"], "status": "SUCCESS"} for img in options["images"]],
+    }
+    blocks = [{"type": "paragraph", "style": None, "runs": [{"text": "x", "formatting": {}}], "images": []}]
+    images = [{"id": f"rId{i}", "extracted_path": f"/tmp/image{i}.png"} for i in range(5)]
+    results = {"errors": []}
+
+    end_result = server._stream_word_content(
+        iter([(blocks, None), (blocks, {"Normal": "Body Text"})]), {}, lambda: images, results
+    )
+
+    assert indesign.actions() == [
+        "beginLayoutWordContent",
+        "layoutWordContentChunk",
+        "layoutWordContentChunk",
+        "endLayoutWordContent",
+        "placeImagesFromWord",
+        "placeImagesFromWord",
+        "placeImagesFromWord",
+    ]
+    assert indesign.commands[2][1]["styleMapping"] == {"Normal": "Body Text"}
+    assert "images" not in indesign.commands[3][1]
+    assert [len(options["images"]) for _, options in indesign.commands[4:]] == [2, 2, 1]
+    assert end_result["response"]["imagesPlaced"] == 5
+    assert end_result["response"]["stepsCompleted"] == ["laid_out_content", "placed_images"]
+    assert results["errors"] == []
+
+
+def test_stream_word_content_ends_session_after_failed_chunk(indesign):
+    indesign.handlers["beginLayoutWordContent"] = lambda options: {"sessionId": "1"}
+
+    def fail(options):
+        raise RuntimeError("layout broke")
+
+    indesign.handlers["layoutWordContentChunk"] = fail
+    results = {"errors": []}
+
+    server._stream_word_content(iter([([], None), ([], None)]), {}, lambda: [], results)
+
+    assert indesign.actions() == [
+        "beginLayoutWordContent", "layoutWordContentChunk", "endLayoutWordContent"
+    ]
+    assert results["errors"] == ["Layout error: layout broke"]
+
+
+def test_save_document_skips_clean_document(indesign):
+    state = {"dirty": False, "saved": True, "filePath": "/docs/layout.indd"}
+    indesign.handlers["isDocumentDirty"] = lambda options: state
+
+    assert server.save_document() == {"status": "skipped", "reason": "not_dirty"}
+    assert indesign.actions() == ["isDocumentDirty"]
+
+    # Unsaved changes, a new path, or force all save
+    state["dirty"] = True
+    server.save_document()
+    server.save_document("/docs/copy.indd")
+    state["dirty"] = False
+    server.save_document(force=True)
+    assert indesign.actions().count("saveDocument") == 3
+
+
+def test_save_document_when_state_unavailable(indesign):
+    def unsupported(options):
+        raise socket_client.AppError("Unknown command: isDocumentDirty")
+
+    indesign.handlers["isDocumentDirty"] = unsupported
+
+    server.save_document()
+    assert indesign.actions()[-1] == "saveDocument"
+
+
+def test_document_state_connection_errors_propagate(indesign):
+    def timed_out(options):
+        raise RuntimeError("Connection Timed Out")
+
+    indesign.handlers["isDocumentDirty"] = timed_out
+
+    with pytest.raises(RuntimeError, match="Timed Out"):
+        server.save_document()
+    with pytest.raises(RuntimeError, match="Timed Out"):
+        server.export_pdf("/docs/out.pdf")
+    assert "saveDocument" not in indesign.actions()
+
+
+def test_export_pdf_skips_only_matching_export(tmp_path, indesign):
+    source = tmp_path / "layout.indd"
+    source.write_bytes(b"indd")
+    pdf = tmp_path / "out.pdf"
+    state = {"dirty": False, "saved": True, "filePath": str(source)}
+    indesign.handlers["isDocumentDirty"] = lambda options: state
+    indesign.handlers["exportPdf"] = lambda options: pdf.write_bytes(b"pdf") or {"exported": True}
+
+    def exports():
+        return indesign.actions().count("exportPdf")
+
+    server.export_pdf(str(pdf), preset="Print")
+    assert server.export_pdf(str(pdf), preset="Print") == {"status": "skipped", "reason": "up_to_date"}
+    assert exports() == 1
+
+    # A different preset, a dirty document, or a forced export all re-export
+    server.export_pdf(str(pdf), preset="Web")
+    assert exports() == 2
+    state["dirty"] = True
+    server.export_pdf(str(pdf), preset="Web")
+    assert exports() == 3
+    state["dirty"] = False
+    server.export_pdf(str(pdf), preset="Web", force=True)
+    assert exports() == 4
+
+    # A file at the path that this server didn't write doesn't count
+    other = tmp_path / "other.pdf"
+    other.write_bytes(b"someone else's pdf")
+    server.export_pdf(str(other), preset="Web")
+    assert exports() == 5
+
+
+def test_import_word_pipeline(sample_docx, indesign, monkeypatch):
+    monkeypatch.setattr(server, "LAYOUT_CHUNK_MAX_BLOCKS", 3)
+    laid_out = []
+    indesign.handlers["beginLayoutWordContent"] = lambda options: {"sessionId": "1"}
+    indesign.handlers["layoutWordContentChunk"] = lambda options: laid_out.extend(
+        decode_columns(options["columns"])
+    ) or {}
+    indesign.handlers["endLayoutWordContent"] = lambda options: {
+        "stepsCompleted": ["laid_out_content"], "errors": [], "paragraphsPlaced": len(laid_out)
+    }
+    indesign.handlers["placeImagesFromWord"] = lambda options: {
+        "placed": len(options["images"]), "results": []
+    }
+
+    results = asyncio.run(server.import_word_to_indesign(sample_docx))
+
+    assert results["status"] == "success", results["errors"]
+    assert results["steps_completed"] == ["parsed_word_document", "laid_out_content", "placed_images"]
+    assert results["images_placed"] == 2
+    assert results["style_mapping"] == {"heading 1": "heading 1", "Normal": "Body Text"}
+
+    parsed = docx_parser.parse_docx(sample_docx, include_images=False)
+    assert laid_out == [layout_view(block) for block in parsed["content"]]
+
+    # The pipelined parse is cached, so a second import doesn't parse again
+    assert server._cached_parse(server._parse_key(sample_docx), True) is not None
+
+    # Images went to the configured store, not the default one
+    images = server._get_parsed(server._parse_key(sample_docx))["images"]
+    assert all(img["extracted_path"].startswith(docx_parser.IMAGE_STORE_DIR) for img in images)
+
+
+def test_parse_word_document_detail(sample_docx):
+    summary = asyncio.run(server.parse_word_document(sample_docx))
+    assert summary["status"] == "success"
+    assert summary["content_blocks"] == 7
+    assert summary["images_found"] == 2
+    assert "content" not in summary and "images" not in summary
+
+    full = asyncio.run(server.parse_word_document(sample_docx, detail="full"))
+    assert len(full["content"]) == 7
+    assert len(full["images"]) == 2
+    assert full["parse_token"] == summary["parse_token"]
+
+    unknown = asyncio.run(server.parse_word_document(sample_docx, detail="everything"))
+    assert unknown == {"status": "error", "message": "Unknown detail level: everything"}
+
+
+def test_get_parsed_content_pages(sample_docx):
+    token = asyncio.run(server.parse_word_document(sample_docx))["parse_token"]
+    content = docx_parser.parse_docx(sample_docx, include_images=False)["content"]
+
+    pages = []
+    for offset in range(0, 7, 3):
+        page = asyncio.run(server.get_parsed_content(token, offset=offset, limit=3))
+        assert page["total_blocks"] == 7
+        assert len(page["images"]) == 2
+        pages.extend(page["content"])
+    assert pages == content
+
+    past_end = asyncio.run(server.get_parsed_content(token, offset=10))
+    assert past_end["content"] == []
+
+    expired = asyncio.run(server.get_parsed_content("no-such-token"))
+    assert expired["status"] == "error"
@@ -0,0 +1,115 @@
+"""Test the persistent proxy connection without a running proxy."""
+import pytest
+import socketio
+
+from adobe_mcp.shared import socket_client
+
+
+class FakeClient:
+    """Stands in for socketio.Client; replies come from the test's reply function."""
+
+    def __init__(self, proxy, **kwargs):
+        self.proxy = proxy
+        self.handlers = {}
+        self.connected = False
+        self.sid = f"sid{len(proxy.clients)}"
+        self.sent = []
+
+    def event(self, handler):
+        self.handlers[handler.__name__] = handler
+        return handler
+
+    def connect(self, url, **kwargs):
+        self.connected = True
+        self.handlers["connect"]()
+
+    def disconnect(self):
+        self.connected = False
+        self.handlers["disconnect"]()
+
+    def emit(self, event, packet):
+        if self.proxy.fail_emits:
+            self.proxy.fail_emits -= 1
+            raise socketio.exceptions.BadNamespaceError("connection went away")
+        self.sent.append(packet["command"])
+        response = self.proxy.reply(packet["command"])
+        if response is not None:
+            self.handlers["packet_response"](response)
+
+
+class FakeProxy:
+    def __init__(self):
+        self.clients = []
+        self.fail_emits = 0
+        self.reply = lambda command: {"status": "SUCCESS", "response": command}
+
+    def client(self, **kwargs):
+        sio = FakeClient(self, **kwargs)
+        self.clients.append(sio)
+        return sio
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    fake = FakeProxy()
+    monkeypatch.setattr(socketio, "Client", fake.client)
+    monkeypatch.setattr(socket_client, "application", "indesign")
+    monkeypatch.setattr(socket_client, "proxy_url", "http://localhost:3001")
+    monkeypatch.setattr(socket_client, "proxy_timeout", 5)
+    socket_client.close()
+    yield fake
+    socket_client.close()
+
+
+def test_connection_reused(proxy):
+    assert socket_client.send_message_blocking("first")["response"] == "first"
+    assert socket_client.send_message_blocking("second")["response"] == "second"
+
+    assert len(proxy.clients) == 1
+    assert proxy.clients[0].sent == ["first", "second"]
+
+
+def test_reconnects_after_drop(proxy):
+    socket_client.send_message_blocking("first")
+    proxy.clients[0].disconnect()
+
+    assert socket_client.send_message_blocking("second")["response"] == "second"
+    assert len(proxy.clients) == 2
+
+
+def test_reconnects_once_when_send_fails(proxy):
+    proxy.fail_emits = 1
+    assert socket_client.send_message_blocking("command")["response"] == "command"
+    assert len(proxy.clients) == 2
+
+    proxy.fail_emits = 2
+    with pytest.raises(RuntimeError, match="Could not send command"):
+        socket_client.send_message_blocking("command")
+
+
+def test_timeout_drops_connection(proxy):
+    proxy.reply = lambda command: None
+    with pytest.raises(RuntimeError, match="Timed Out"):
+        socket_client.send_message_blocking("slow", timeout=0.01)
+    assert not proxy.clients[0].connected
+
+    # A late answer on the abandoned connection isn't read as the next response
+    proxy.clients[0].handlers["packet_response"]({"status": "SUCCESS", "response": "slow"})
+    proxy.reply = lambda command: {"status": "SUCCESS", "response": command}
+    assert socket_client.send_message_blocking("next")["response"] == "next"
+    assert len(proxy.clients) == 2
+
+
+def test_disconnect_while_waiting(proxy):
+    def drop(command):
+        proxy.clients[-1].disconnect()
+
+    proxy.reply = drop
+    with pytest.raises(RuntimeError, match="Lost connection"):
+        socket_client.send_message_blocking("command")
+
+
+def test_failure_raises_app_error(proxy):
+    proxy.reply = lambda command: {"status": "FAILURE", "message": "no document"}
+    with pytest.raises(socket_client.AppError, match="no document"):
+        socket_client.send_message_blocking("command")
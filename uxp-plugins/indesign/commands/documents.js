@@ -76,6 +76,19 @@ const saveDocument = async (command) => {
     }
 };
 
+/**
+ * Report whether the active document has unsaved changes
+ */
+const isDocumentDirty = async (command) => {
+    const doc = app.activeDocument;
+    
+    return {
+        dirty: doc.modified,
+        saved: doc.saved,
+        filePath: doc.saved ? doc.fullName.fsName : null
+    };
+};
+
 /**
  * Export the document as PDF
  */
@@ -110,5 +123,6 @@ const exportPdf = async (command) => {
 module.exports = {
     openDocument,
     saveDocument,
+    isDocumentDirty,
     exportPdf
 };
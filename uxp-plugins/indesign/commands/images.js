@@ -204,8 +204,41 @@ const placeImageFromWord = async (command) => {
     });
 };
 
+/**
+ * Place several images from a Word document import in one command.
+ * Each image is placed independently so one failure doesn't abort the rest.
+ */
+const placeImagesFromWord = async (command) => {
+    const options = command.options;
+    const images = options.images || [];
+    const results = [];
+    let placed = 0;
+    
+    for (const image of images) {
+        try {
+            await placeImageFromWord({
+                options: { ...image, autoPosition: options.autoPosition }
+            });
+            placed++;
+            results.push({ imageId: image.imageId, status: "SUCCESS" });
+        } catch (e) {
+            results.push({
+                imageId: image.imageId,
+                status: "FAILURE",
+                message: `${e}`
+            });
+        }
+    }
+    
+    return {
+        placed: placed,
+        results: results
+    };
+};
+
 module.exports = {
     placeImage,
     getImages,
-    placeImageFromWord
+    placeImageFromWord,
+    placeImagesFromWord
 };
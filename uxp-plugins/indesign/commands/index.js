@@ -28,10 +28,15 @@ const {app, DocumentIntentOptions} = require("indesign");
 // Import command modules
 const { getParagraphStyles, createParagraphStyle, applyParagraphStyle } = require("./styles.js");
 const { createTextFrame, getTextFrames, linkTextFrames, insertText } = require("./textframes.js");
-const { placeImage, getImages, placeImageFromWord } = require("./images.js");
+const { placeImage, getImages, placeImageFromWord, placeImagesFromWord } = require("./images.js");
 const { addPage, getPages, getMasterPages } = require("./pages.js");
-const { openDocument, saveDocument, exportPdf } = require("./documents.js");
-const { layoutWordContent } = require("./layout.js");
+const { openDocument, saveDocument, isDocumentDirty, exportPdf } = require("./documents.js");
+const {
+    layoutWordContent,
+    beginLayoutWordContent,
+    layoutWordContentChunk,
+    endLayoutWordContent
+} = require("./layout.js");
 
 
 const createDocument = async (command) => {
@@ -97,6 +102,7 @@ const commandHandlers = {
     // Document management
     openDocument,
     saveDocument,
+    isDocumentDirty,
     exportPdf,
     
     // Paragraph styles
@@ -114,6 +120,7 @@ const commandHandlers = {
     placeImage,
     getImages,
     placeImageFromWord,
+    placeImagesFromWord,
     
     // Pages
     addPage,
@@ -121,7 +128,10 @@ const commandHandlers = {
     getMasterPages,
     
     // Word import layout
-    layoutWordContent
+    layoutWordContent,
+    beginLayoutWordContent,
+    layoutWordContentChunk,
+    endLayoutWordContent
 };
 
 
@@ -164,7 +174,7 @@ const checkRequiresActiveDocument = async (command) => {
 
 const requiresActiveDocument = (command) => {
     // Commands that don't require an active document
-    const noDocRequired = ["createDocument", "openDocument"];
+    const noDocRequired = ["createDocument", "openDocument", "beginLayoutWordContent"];
     return !noDocRequired.includes(command.action);
 };
 
@@ -22,17 +22,18 @@
  */
 
 const { app } = require("indesign");
+const { openDocument } = require("./documents.js");
 
 /**
- * Layout Word document content into InDesign
- * This is the main orchestration function for Word import
+ * Set up layout of Word content into the active document. The returned
+ * layoutBlocks() can be called repeatedly; each call continues flowing
+ * content from where the previous one stopped.
  */
-const layoutWordContent = async (command) => {
+const createWordLayout = (options) => {
     const doc = app.activeDocument;
-    const options = command.options;
     
-    const content = options.content || [];
-    const styleMapping = options.styleMapping || {};
+    // Copied so mappings added by later chunks don't alter the caller's object
+    const styleMapping = { ...(options.styleMapping || {}) };
     const autoFlow = options.autoFlow !== false;
     const startPage = options.startPage || 0;
     
@@ -109,129 +110,306 @@ const layoutWordContent = async (command) => {
         }
     };
     
+    // Flatten a table cell to text; nested tables contribute their rows
+    // space-separated so the outer cell stays on one tab-delimited line
+    const getCellText = (cell) => {
+        let cellContent = "";
+        for (const item of cell) {
+            if (item.type === "table") {
+                const rowTexts = (item.rows || []).map(
+                    (row) => row.map(getCellText).join(" ")
+                );
+                cellContent += rowTexts.join(" ");
+            } else if (item.runs) {
+                for (const run of item.runs) {
+                    cellContent += run.text || "";
+                }
+            }
+        }
+        return cellContent;
+    };
+    
     // Create initial text frame
     currentTextFrame = getOrCreateTextFrame(currentPageIndex);
     linkedFrames.push(currentTextFrame);
     
     // Process each content block
-    for (let i = 0; i < content.length; i++) {
-        const block = content[i];
-        
-        if (block.type === "paragraph") {
-            // Build paragraph text from runs
-            let paragraphText = "";
-            if (block.runs && block.runs.length > 0) {
-                for (const run of block.runs) {
-                    paragraphText += run.text || "";
-                }
-            }
+    const layoutBlocks = (content) => {
+        for (let i = 0; i < content.length; i++) {
+            const block = content[i];
             
-            // Add paragraph separator
-            if (paragraphText.length > 0) {
-                paragraphText += "\r"; // InDesign paragraph break
-            } else if (block.style) {
-                // Empty paragraph with style (intentional spacing)
-                paragraphText = "\r";
-            } else {
-                continue; // Skip completely empty blocks
-            }
-            
-            // Insert text at end of current frame's story
-            const insertionPoint = currentTextFrame.parentStory.insertionPoints[-1];
-            const startIndex = currentTextFrame.parentStory.characters.length;
-            insertionPoint.contents = paragraphText;
-            
-            // Apply paragraph style
-            if (block.style) {
-                const style = getOrCreateStyle(block.style);
-                try {
-                    // Get the paragraph we just inserted
-                    const story = currentTextFrame.parentStory;
-                    const lastPara = story.paragraphs[-1];
-                    if (lastPara) {
-                        lastPara.appliedParagraphStyle = style;
+            if (block.type === "paragraph") {
+                // Build paragraph text from runs
+                let paragraphText = "";
+                if (block.runs && block.runs.length > 0) {
+                    for (const run of block.runs) {
+                        paragraphText += run.text || "";
                     }
-                } catch (e) {
-                    console.log(`Failed to apply style: ${e}`);
                 }
-            }
-            
-            // Apply inline formatting from runs
-            if (block.runs && block.runs.length > 0) {
-                let charIndex = startIndex;
-                for (const run of block.runs) {
-                    if (run.text && run.formatting) {
-                        const runLength = run.text.length;
-                        try {
-                            const story = currentTextFrame.parentStory;
-                            for (let c = charIndex; c < charIndex + runLength && c < story.characters.length; c++) {
-                                const char = story.characters[c];
-                                
-                                if (run.formatting.bold) {
-                                    char.fontStyle = "Bold";
-                                }
-                                if (run.formatting.italic) {
-                                    char.fontStyle = run.formatting.bold ? "Bold Italic" : "Italic";
-                                }
-                                if (run.formatting.underline) {
-                                    char.underline = true;
-                                }
-                            }
-                        } catch (e) {
-                            // Formatting application failed, continue
+                
+                // Add paragraph separator
+                if (paragraphText.length > 0) {
+                    paragraphText += "\r"; // InDesign paragraph break
+                } else if (block.style) {
+                    // Empty paragraph with style (intentional spacing)
+                    paragraphText = "\r";
+                } else {
+                    continue; // Skip completely empty blocks
+                }
+                
+                // Insert text at end of current frame's story
+                const insertionPoint = currentTextFrame.parentStory.insertionPoints[-1];
+                const startIndex = currentTextFrame.parentStory.characters.length;
+                insertionPoint.contents = paragraphText;
+                
+                // Apply paragraph style
+                if (block.style) {
+                    const style = getOrCreateStyle(block.style);
+                    try {
+                        // Get the paragraph we just inserted
+                        const story = currentTextFrame.parentStory;
+                        const lastPara = story.paragraphs[-1];
+                        if (lastPara) {
+                            lastPara.appliedParagraphStyle = style;
                         }
-                        charIndex += runLength;
+                    } catch (e) {
+                        console.log(`Failed to apply style: ${e}`);
                     }
                 }
-            }
-            
-            paragraphsPlaced++;
-            
-            // Check for overflow and create new linked frame if needed
-            if (autoFlow && currentTextFrame.overflows) {
-                currentPageIndex++;
-                const newFrame = getOrCreateTextFrame(currentPageIndex);
-                currentTextFrame.nextTextFrame = newFrame;
-                linkedFrames.push(newFrame);
-                currentTextFrame = newFrame;
-            }
-        } else if (block.type === "table") {
-            // Basic table support - convert to text for now
-            // Full table support would require more complex implementation
-            let tableText = "";
-            for (const row of block.rows || []) {
-                const cellTexts = [];
-                for (const cell of row) {
-                    let cellContent = "";
-                    for (const para of cell) {
-                        if (para.runs) {
-                            for (const run of para.runs) {
-                                cellContent += run.text || "";
+                
+                // Apply inline formatting from runs
+                if (block.runs && block.runs.length > 0) {
+                    let charIndex = startIndex;
+                    for (const run of block.runs) {
+                        if (run.text && run.formatting) {
+                            const runLength = run.text.length;
+                            try {
+                                const story = currentTextFrame.parentStory;
+                                for (let c = charIndex; c < charIndex + runLength && c < story.characters.length; c++) {
+                                    const char = story.characters[c];
+                                    
+                                    if (run.formatting.bold) {
+                                        char.fontStyle = "Bold";
+                                    }
+                                    if (run.formatting.italic) {
+                                        char.fontStyle = run.formatting.bold ? "Bold Italic" : "Italic";
+                                    }
+                                    if (run.formatting.underline) {
+                                        char.underline = true;
+                                    }
+                                }
+                            } catch (e) {
+                                // Formatting application failed, continue
                             }
+                            charIndex += runLength;
                         }
                     }
-                    cellTexts.push(cellContent);
                 }
-                tableText += cellTexts.join("\t") + "\r";
-            }
-            
-            if (tableText) {
-                const insertionPoint = currentTextFrame.parentStory.insertionPoints[-1];
-                insertionPoint.contents = tableText;
+                
                 paragraphsPlaced++;
+                
+                // Check for overflow and create new linked frame if needed
+                if (autoFlow && currentTextFrame.overflows) {
+                    currentPageIndex++;
+                    const newFrame = getOrCreateTextFrame(currentPageIndex);
+                    currentTextFrame.nextTextFrame = newFrame;
+                    linkedFrames.push(newFrame);
+                    currentTextFrame = newFrame;
+                }
+            } else if (block.type === "table") {
+                // Basic table support - convert to text for now
+                // Full table support would require more complex implementation
+                let tableText = "";
+                for (const row of block.rows || []) {
+                    const cellTexts = [];
+                    for (const cell of row) {
+                        cellTexts.push(getCellText(cell));
+                    }
+                    tableText += cellTexts.join("\t") + "\r";
+                }
+                
+                if (tableText) {
+                    const insertionPoint = currentTextFrame.parentStory.insertionPoints[-1];
+                    insertionPoint.contents = tableText;
+                    paragraphsPlaced++;
+                }
             }
         }
-    }
+        
+    };
     
-    return {
+    const summary = () => ({
         pagesCreated: pagesCreated,
         paragraphsPlaced: paragraphsPlaced,
         framesCreated: linkedFrames.length,
         startPage: startPage,
         endPage: currentPageIndex
+    });
+    
+    // Add mappings for styles first seen in later chunks
+    const addStyleMapping = (mapping) => {
+        Object.assign(styleMapping, mapping);
     };
+    
+    return { layoutBlocks, summary, addStyleMapping };
+};
+
+/**
+ * Layout Word document content into InDesign
+ * This is the main orchestration function for Word import
+ */
+const layoutWordContent = async (command) => {
+    const layout = createWordLayout(command.options);
+    layout.layoutBlocks(command.options.content || []);
+    return layout.summary();
+};
+
+// Layouts started by beginLayoutWordContent, keyed by session id
+const layoutSessions = new Map();
+let nextLayoutSessionId = 1;
+
+// Open the import template, if any, recording the outcome on the result
+const openWordTemplate = async (templatePath, result) => {
+    if (!templatePath) {
+        return;
+    }
+    try {
+        await openDocument({ options: { filePath: templatePath } });
+        result.stepsCompleted.push("opened_template");
+    } catch (e) {
+        result.errors.push(`Failed to open template: ${e}`);
+    }
+};
+
+const newImportResult = () => ({
+    stepsCompleted: [],
+    errors: [],
+    pagesCreated: 0,
+    paragraphsPlaced: 0,
+    imagesPlaced: 0
+});
+
+/**
+ * Start a Word import whose content arrives in several
+ * layoutWordContentChunk commands. Opens the template (if any) and
+ * returns the session id to pass to the following commands; the template
+ * outcome is reported by endLayoutWordContent with the rest of the import.
+ */
+const beginLayoutWordContent = async (command) => {
+    const options = command.options;
+    const result = newImportResult();
+    
+    await openWordTemplate(options.templatePath, result);
+    if (!app.activeDocument) {
+        throw new Error("beginLayoutWordContent : Requires an open InDesign document");
+    }
+    
+    const sessionId = String(nextLayoutSessionId++);
+    layoutSessions.set(sessionId, {
+        layout: createWordLayout(options),
+        result: result,
+        failed: false
+    });
+    
+    return { sessionId: sessionId };
+};
+
+const getLayoutSession = (sessionId) => {
+    const session = layoutSessions.get(sessionId);
+    if (!session) {
+        throw new Error(`Unknown layout session: ${sessionId}`);
+    }
+    return session;
+};
+
+// Run formatting bits used by columnar content (RUN_* in docx_parser.py)
+const RUN_BOLD = 1;
+const RUN_ITALIC = 2;
+const RUN_UNDERLINE = 4;
+
+// Rebuild content blocks from the parallel arrays sent by the MCP server
+const decodeColumnarContent = (columns) => {
+    const styleNames = columns.styleNames || [];
+    const styles = columns.styles || [];
+    const runCounts = columns.runCounts || [];
+    const runTexts = columns.runTexts || [];
+    const runFlags = columns.runFlags || [];
+    const tables = columns.tables || {};
+    
+    const content = [];
+    let runIndex = 0;
+    for (let i = 0; i < styles.length; i++) {
+        const style = styles[i] >= 0 ? styleNames[styles[i]] : null;
+        const rows = tables[String(i)];
+        if (rows) {
+            content.push({ type: "table", style: style, rows: rows });
+            continue;
+        }
+        
+        const runs = [];
+        for (let r = 0; r < runCounts[i]; r++, runIndex++) {
+            const flags = runFlags[runIndex];
+            runs.push({
+                text: runTexts[runIndex],
+                formatting: {
+                    bold: (flags & RUN_BOLD) !== 0,
+                    italic: (flags & RUN_ITALIC) !== 0,
+                    underline: (flags & RUN_UNDERLINE) !== 0
+                }
+            });
+        }
+        content.push({ type: "paragraph", style: style, runs: runs });
+    }
+    return content;
+};
+
+/**
+ * Lay out the next chunk of content for a session. The chunk comes either
+ * as content blocks or as columnar arrays.
+ */
+const layoutWordContentChunk = async (command) => {
+    const options = command.options;
+    const session = getLayoutSession(options.sessionId);
+    const content = options.columns
+        ? decodeColumnarContent(options.columns)
+        : options.content || [];
+    if (options.styleMapping) {
+        session.layout.addStyleMapping(options.styleMapping);
+    }
+    
+    try {
+        session.layout.layoutBlocks(content);
+    } catch (e) {
+        session.failed = true;
+        throw e;
+    }
+    
+    return session.layout.summary();
+};
+
+/**
+ * Finish a session and report the import result. Images are placed
+ * afterwards with placeImagesFromWord, a group per command.
+ */
+const endLayoutWordContent = async (command) => {
+    const options = command.options;
+    const session = getLayoutSession(options.sessionId);
+    layoutSessions.delete(options.sessionId);
+    
+    const result = session.result;
+    const layout = session.layout.summary();
+    if (!session.failed) {
+        result.stepsCompleted.push("laid_out_content");
+    }
+    result.pagesCreated = layout.pagesCreated;
+    result.paragraphsPlaced = layout.paragraphsPlaced;
+    
+    return result;
 };
 
 module.exports = {
-    layoutWordContent
+    layoutWordContent,
+    beginLayoutWordContent,
+    layoutWordContentChunk,
+    endLayoutWordContent
 };